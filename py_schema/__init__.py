@@ -1 +1,2 @@
-from .py_schema import *
\ No newline at end of file
+from .py_schema import *
+from .snapshot import dump_snapshot, load_snapshot, freeze_schemas
@@ -0,0 +1,517 @@
+import re
+import string
+
+try:
+    import re._parser as sre_parse
+    import re._constants as sre_constants
+except ImportError:  # python < 3.11
+    import sre_parse
+    import sre_constants
+
+from .py_schema import BaseField, StrField, DictField, ListField, RegexField, OrField, RegexUnionField, \
+    FormatField
+
+# the char sets are (negated, chars) tuples
+_EMPTY = (False, frozenset())
+_ANY = (True, frozenset())
+
+_DIGITS = frozenset(string.digits)
+_SPACES = frozenset(string.whitespace)
+_WORD = frozenset(string.ascii_letters + string.digits + '_')
+
+_CATEGORY_CHARS = {
+    sre_constants.CATEGORY_DIGIT: (False, _DIGITS),
+    sre_constants.CATEGORY_NOT_DIGIT: (True, _DIGITS),
+    sre_constants.CATEGORY_SPACE: (False, _SPACES),
+    sre_constants.CATEGORY_NOT_SPACE: (True, _SPACES),
+    sre_constants.CATEGORY_WORD: (False, _WORD),
+    sre_constants.CATEGORY_NOT_WORD: (True, _WORD),
+}
+
+# ranges bigger than this are handled as any char
+_MAX_RANGE = 1024
+
+_REPEATS = (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT)
+
+
+def _union(chars, other):
+    if not chars[0] and not other[0]:
+        return False, chars[1] | other[1]
+
+    if chars[0] and other[0]:
+        return True, chars[1] & other[1]
+
+    if chars[0]:
+        chars, other = other, chars
+
+    return True, other[1] - chars[1]
+
+
+def _overlaps(chars, other) -> bool:
+    if chars[0] and other[0]:
+        return True
+
+    if chars[0]:
+        chars, other = other, chars
+
+    if other[0]:
+        return bool(chars[1] - other[1])
+
+    return bool(chars[1] & other[1])
+
+
+def _is_subset(chars, other) -> bool:
+    if chars[0]:
+        return other[0] and other[1] <= chars[1]
+
+    if other[0]:
+        return not chars[1] & other[1]
+
+    return chars[1] <= other[1]
+
+
+def _class_chars(items):
+    chars = _EMPTY
+    negated = False
+
+    for op, av in items:
+        if op is sre_parse.NEGATE:
+            negated = True
+        elif op is sre_parse.LITERAL:
+            chars = _union(chars, (False, frozenset(chr(av))))
+        elif op is sre_parse.RANGE and av[1] - av[0] <= _MAX_RANGE:
+            chars = _union(chars, (False, frozenset(chr(code) for code in range(av[0], av[1] + 1))))
+        elif op is sre_parse.CATEGORY and av in _CATEGORY_CHARS:
+            chars = _union(chars, _CATEGORY_CHARS[av])
+        else:
+            chars = _ANY
+
+    if negated:
+        return _ANY if chars[0] else (True, chars[1])
+
+    return chars
+
+
+def _first(items, last: bool = False) -> tuple:
+    """
+    Returns the chars that can start (or end, if `last`) a match of the sequence and True
+    if it can match an empty string.
+    """
+    chars = _EMPTY
+
+    for op, av in (reversed(items) if last else items):
+        item_chars, nullable = _item_first(op, av, last)
+        chars = _union(chars, item_chars)
+
+        if not nullable:
+            return chars, False
+
+    return chars, True
+
+
+def _item_first(op, av, last: bool = False) -> tuple:
+    if op is sre_parse.LITERAL:
+        return (False, frozenset(chr(av))), False
+
+    if op is sre_parse.NOT_LITERAL:
+        return (True, frozenset(chr(av))), False
+
+    if op is sre_parse.ANY:
+        return _ANY, False
+
+    if op is sre_parse.IN:
+        return _class_chars(av), False
+
+    if op is sre_parse.AT or op is sre_parse.ASSERT or op is sre_parse.ASSERT_NOT:
+        return _EMPTY, True
+
+    if op is sre_parse.SUBPATTERN:
+        return _first(av[-1], last)
+
+    if op is sre_parse.BRANCH:
+        chars = _EMPTY
+        nullable = False
+
+        for branch in av[1]:
+            branch_chars, branch_nullable = _first(branch, last)
+            chars = _union(chars, branch_chars)
+            nullable = nullable or branch_nullable
+
+        return chars, nullable
+
+    if op in _REPEATS:
+        chars, nullable = _first(av[2], last)
+
+        return chars, nullable or av[0] == 0
+
+    # group references and the other operations can match anything
+    return _ANY, True
+
+
+def _chars(items):
+    """
+    Returns all the chars that the sequence can match.
+    """
+    chars = _EMPTY
+
+    for op, av in items:
+        if op is sre_parse.SUBPATTERN:
+            item_chars = _chars(av[-1])
+        elif op is sre_parse.BRANCH:
+            item_chars = _EMPTY
+
+            for branch in av[1]:
+                item_chars = _union(item_chars, _chars(branch))
+        elif op in _REPEATS:
+            item_chars = _chars(av[2])
+        else:
+            item_chars = _item_first(op, av)[0]
+
+        chars = _union(chars, item_chars)
+
+    return chars
+
+
+def _is_unbounded(op, av) -> bool:
+    return op in _REPEATS and av[1] is sre_parse.MAXREPEAT
+
+
+def _variable_tails(items):
+    """
+    Yields the items of the variable length parts (repeats, alternatives with an empty one)
+    that can end a match of the sequence.
+    """
+    for op, av in reversed(items):
+        if op in _REPEATS:
+            if av[0] != av[1]:
+                yield av[2]
+
+            yield from _variable_tails(av[2])
+        elif op is sre_parse.SUBPATTERN:
+            yield from _variable_tails(av[-1])
+        elif op is sre_parse.BRANCH:
+            if any(_first(branch)[1] for branch in av[1]):
+                yield [item for branch in av[1] for item in branch]
+
+            for branch in av[1]:
+                yield from _variable_tails(branch)
+
+        if not _item_first(op, av)[1]:
+            return
+
+
+def _ambiguous_branches(items) -> bool:
+    for op, av in items:
+        if op is sre_parse.BRANCH:
+            seen = []
+            nullable_seen = False
+
+            for branch in av[1]:
+                branch_chars, nullable = _first(branch)
+
+                # two alternatives matching an empty string overlap too (ex: `(a|a)`, parsed as `a(|)`)
+                if any(_overlaps(chars, branch_chars) for chars in seen) or (nullable and nullable_seen):
+                    return True
+
+                seen.append(branch_chars)
+                nullable_seen = nullable_seen or nullable
+        elif op is sre_parse.SUBPATTERN and _ambiguous_branches(av[-1]):
+            return True
+
+    return False
+
+
+def _flatten(items) -> list:
+    """
+    Returns the sequence with the groups replaced by their items.
+    """
+    flat = []
+
+    for op, av in items:
+        if op is sre_parse.SUBPATTERN:
+            flat.extend(_flatten(av[-1]))
+        else:
+            flat.append((op, av))
+
+    return flat
+
+
+def _backtracking_body(body) -> bool:
+    """
+    True if the body of a repeat has an unbounded repeat whose chars overlap the chars that follow it,
+    up to the start of the next iteration (ex: `.*,` in `(.*,){11}`): each iteration can end at any
+    of these chars, so the iterations can split a string in many ways.
+    """
+    items = _flatten(body)
+    body_first = _first(items)[0]
+
+    for index, (op, av) in enumerate(items):
+        if _is_unbounded(op, av):
+            following, nullable = _first(items[index + 1:])
+
+            if nullable:
+                following = _union(following, body_first)
+
+            if _overlaps(_chars(av[2]), following):
+                return True
+
+    return False
+
+
+def regex_degree(items) -> float:
+    """
+    Returns the degree of the worst-case backtracking of a parsed regex, the number of scanned chars
+    being at most the string length to this power: 1 if linear, `inf` if exponential.
+
+    It's a heuristic:
+    - exponential: a repeat (unbounded or with a max above 1) whose body can end with a variable repeat that overlaps the
+      body start (ex: `(a+)+`, `(\\w+\\s?)+`) or has alternatives with overlapping starts (ex: `(a|aa)*`),
+      or an unbounded repeat of a body that backtracks at each iteration (ex: `(.*,)*`)
+    - polynomial: an unbounded repeat that can start with the chars that end a previous one, without a
+      mandatory char between them that the previous one can't match (ex: `\\d+\\d+`, `.*=.*`, degree 2), or
+      a repeat of `n` iterations of a body that backtracks at each iteration (ex: `(.*,){11}`, degree 11)
+    """
+    degree = 1
+    previous = False
+    previous_chars = _EMPTY
+
+    for op, av in items:
+        if op in _REPEATS:
+            body = av[2]
+            body_first = _first(body)[0]
+
+            # the bounded repeats backtrack exponentially in their max too (ex: `(a+){2,20}`)
+            if av[1] > 1 and (
+                    any(_overlaps(_chars(tail), body_first) for tail in _variable_tails(body)) or
+                    _ambiguous_branches(body)):
+                return float('inf')
+
+            if _is_unbounded(op, av):
+                if previous and _overlaps(previous_chars, body_first):
+                    degree = max(degree, 2)
+
+                # the repeats that can match an empty string don't hide the previous ones
+                body_last, nullable = _first(body, last=True)
+                if previous and (nullable or not av[0]):
+                    previous_chars = _union(previous_chars, body_last)
+                else:
+                    previous_chars = body_last
+                previous = True
+
+            nested = regex_degree(body)
+
+            if av[1] > 1 and _backtracking_body(body):
+                nested = float('inf') if _is_unbounded(op, av) else nested * av[1]
+        elif op is sre_parse.SUBPATTERN:
+            nested = regex_degree(av[-1])
+        elif op is sre_parse.BRANCH:
+            nested = max(regex_degree(branch) for branch in av[1])
+        else:
+            nested = 1
+
+            # a mandatory char that the previous repeats can't end with stops their backtracking
+            item_chars, nullable = _item_first(op, av)
+
+            if previous and not nullable and not _is_subset(item_chars, previous_chars):
+                previous = False
+
+        if nested == float('inf'):
+            return nested
+
+        degree = max(degree, nested)
+
+    return degree
+
+
+def regex_complexity(items) -> str:
+    """
+    Returns the worst-case backtracking of a parsed regex: 'linear', 'polynomial' or 'exponential'
+    (see `regex_degree`).
+    """
+    degree = regex_degree(items)
+
+    if degree == 1:
+        return 'linear'
+
+    return 'exponential' if degree == float('inf') else 'polynomial'
+
+
+class CostIssue:
+    __slots__ = ('code', 'path', 'extra')
+
+    def __init__(self, code: str, path: str, extra: dict = None):
+        self.code = code
+        self.path = path
+        self.extra = extra
+
+    def __repr__(self):
+        return 'CostIssue({!r}, {!r}, {!r})'.format(self.code, self.path, self.extra)
+
+
+class CostReport:
+    """
+    The worst-case cost of a schema, in field checks (a regex costs one check per scanned char),
+    the cost of each path and the issues found.
+    """
+
+    def __init__(self, budget: float = None):
+        self.budget = budget
+        self.cost = 0
+        self.costs = {}
+        self.issues = []
+
+    @property
+    def exceeds_budget(self) -> bool:
+        return self.budget is not None and self.cost > self.budget
+
+    def add_issue(self, code: str, path: str, extra: dict = None):
+        self.issues.append(CostIssue(code, path, extra))
+
+    def as_list(self) -> list:
+        return [
+            {
+                'code': issue.code,
+                'path': issue.path,
+                'extra': issue.extra
+            }
+            for issue in self.issues
+        ]
+
+
+class CostAnalyzer:
+    """
+    Walks a schema tree and computes its worst-case validation cost:
+
+    - a `ListField` costs `max_items` times its item cost (infinite without `max_items`)
+    - an `OrField` costs the sum of its branches (all but the last can fail)
+    - a `RegexField` costs the length it can scan (`max_string_length` if unbounded), squared
+      for polynomial backtracking and infinite for exponential backtracking
+    - a format field costs `max_string_length`, the other fields and the `DictField` rules cost 1
+    """
+
+    def __init__(self, budget: float = None, max_string_length: int = 10000):
+        self.budget = budget
+        self.max_string_length = max_string_length
+        self.report = None
+
+    def analyze(self, schema: BaseField) -> CostReport:
+        self.report = CostReport(self.budget)
+        self.report.cost = self.field_cost(schema, '$root', 0)
+
+        if self.report.exceeds_budget:
+            self.report.add_issue('COST_BUDGET_EXCEEDED', '$root', {'cost': self.report.cost, 'budget': self.budget})
+
+        return self.report
+
+    def field_cost(self, field: BaseField, path: str, or_depth: int) -> float:
+        if isinstance(field, DictField):
+            # each cross-field rule costs a check
+            cost = 1 + len(field.rules) + sum(
+                self.field_cost(prop_field, '{}.{}'.format(path, key), or_depth)
+                for key, prop_field in field.schema.items()
+            )
+        elif isinstance(field, ListField):
+            cost = self.list_cost(field, path, or_depth)
+        elif isinstance(field, RegexUnionField):
+            cost = 1 + self.regex_cost(field.pattern, path)
+        elif isinstance(field, OrField):
+            cost = self.or_cost(field, path, or_depth)
+        elif isinstance(field, RegexField):
+            cost = 1 + self.regex_cost(field.regex, path)
+        elif isinstance(field, FormatField):
+            cost = 1 + self.max_string_length
+        else:
+            if isinstance(field, StrField) and field.max_length is None:
+                self.report.add_issue('UNBOUNDED_STRING', path)
+
+            cost = 1
+
+        self.report.costs[path] = cost
+
+        return cost
+
+    def list_cost(self, field: ListField, path: str, or_depth: int) -> float:
+        item_cost = self.field_cost(field.item_schema, '{}.$*'.format(path), or_depth)
+
+        if field.max_items is None:
+            self.report.add_issue('UNBOUNDED_LIST', path)
+
+            return float('inf')
+
+        # the unique checks hash each item once
+        unique_cost = field.max_items if field.unique_items or field.unique_by is not None else 0
+
+        return 1 + field.max_items * item_cost + unique_cost
+
+    def or_cost(self, field: OrField, path: str, or_depth: int) -> float:
+        fanout = self.fanout(field)
+
+        if or_depth == 0 and fanout > len(field.schemas):
+            self.report.add_issue('NESTED_UNION', path, {'fanout': fanout})
+
+        return 1 + sum(
+            self.field_cost(branch, '{}[{}]'.format(path, index), or_depth + 1)
+            for index, branch in enumerate(field.schemas)
+        )
+
+    def fanout(self, field: BaseField) -> int:
+        """
+        Returns the number of combinations of union branches that a value can be checked against.
+        """
+        if isinstance(field, RegexUnionField):
+            return 1
+
+        if isinstance(field, OrField):
+            return sum(self.fanout(branch) for branch in field.schemas)
+
+        if isinstance(field, DictField):
+            fanout = 1
+
+            for prop_field in field.schema.values():
+                fanout *= self.fanout(prop_field)
+
+            return fanout
+
+        if isinstance(field, ListField):
+            return self.fanout(field.item_schema)
+
+        return 1
+
+    def regex_cost(self, regex, path: str) -> float:
+        pattern, flags = (regex, 0) if isinstance(regex, str) else (regex.pattern, regex.flags)
+
+        try:
+            parsed = sre_parse.parse(pattern, flags)
+        except (re.error, TypeError):
+            return self.max_string_length
+
+        max_width = parsed.getwidth()[1]
+
+        # getwidth caps the unbounded widths to MAXREPEAT - 1
+        if max_width >= sre_parse.MAXREPEAT - 1:
+            self.report.add_issue('UNBOUNDED_STRING', path)
+
+        length = min(max_width, self.max_string_length)
+        degree = regex_degree(list(parsed))
+
+        if degree == float('inf'):
+            self.report.add_issue('REGEX_EXPONENTIAL_BACKTRACKING', path, {'regex': pattern})
+
+            return float('inf')
+
+        if degree > 1:
+            self.report.add_issue('REGEX_POLYNOMIAL_BACKTRACKING', path, {'regex': pattern, 'degree': degree})
+
+            try:
+                return float(length) ** degree
+            except OverflowError:
+                return float('inf')
+
+        return length
+
+
+def analyze(schema: BaseField, budget: float = None, max_string_length: int = 10000) -> CostReport:
+    """
+    Returns the worst-case cost report of the schema (see `CostAnalyzer`).
+    """
+    return CostAnalyzer(budget, max_string_length).analyze(schema)
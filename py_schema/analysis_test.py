@@ -0,0 +1,139 @@
+from unittest import TestCase
+
+from py_schema import IntField, StrField, DictField, ListField, RegexField, OrField, UUIDField, Compare
+from py_schema.analysis import analyze, regex_complexity, regex_degree, sre_parse
+from py_schema.optimizer import optimize
+
+
+def complexity(regex: str) -> str:
+    return regex_complexity(list(sre_parse.parse(regex)))
+
+
+class RegexComplexityTest(TestCase):
+    def test_nested_quantifiers_should_be_exponential(self):
+        for regex in [
+            '(a+)+$', '(\\w+\\s?)+$', '(a|aa)+$', '(\\d+)*x', '^([a-z0-9_.+-]+)+@example\\.com\\Z',
+            '^(a|a)*$', '^(a+){2,20}$', '^(.*,)*P'
+        ]:
+            self.assertEqual(complexity(regex), 'exponential', regex)
+
+    def test_overlapping_sequential_quantifiers_should_be_polynomial(self):
+        for regex in ['\\d+\\d+$', '.*=.*$', 'a*b*a*$', '\\w+\\d+$']:
+            self.assertEqual(complexity(regex), 'polynomial', regex)
+
+    def test_repeated_backtracking_bodies_should_scale_the_degree(self):
+        for regex, degree in [('^(.*,){11}P', 11), ('^(.*,){2,5}P', 5), ('(\\d+\\d){3}$', 3)]:
+            self.assertEqual(complexity(regex), 'polynomial', regex)
+            self.assertEqual(regex_degree(list(sre_parse.parse(regex))), degree, regex)
+
+    def test_unambiguous_regexes_should_be_linear(self):
+        for regex in [
+            '\\d{5}\\Z', '(ab+)+$', '(a|b)+$', '\\d+-\\d+$', '^[a-z]+(-[a-z]+)*$', '^(\\w+\\.)*\\w+$',
+            '^https?://[^/]+/.*$', '\\s*\\S+\\s*$', '^(.*,)P', '^([^,]*,){11}P', '[0-9]{3}\\.?[0-9]{3}\\.?[0-9]{3}\\-?[0-9]{2}\\Z'
+        ]:
+            self.assertEqual(complexity(regex), 'linear', regex)
+
+
+class AnalyzeTest(TestCase):
+    def test_list_cost_should_multiply_item_cost(self):
+        report = analyze(ListField(
+            max_items=10,
+            item_schema=DictField(
+                schema={
+                    'id': IntField(),
+                    'zip': RegexField(regex='\\d{5}\\Z')
+                }
+            )
+        ))
+
+        self.assertEqual(report.costs['$root.$*.zip'], 6)
+        self.assertEqual(report.costs['$root.$*'], 1 + 1 + 6)
+        self.assertEqual(report.cost, 1 + 10 * 8)
+        self.assertEqual(report.issues, [])
+
+    def test_dict_rules_should_cost_a_check(self):
+        report = analyze(DictField(
+            schema={
+                'start': IntField(),
+                'end': IntField()
+            },
+            rules=[Compare('end', '>=', 'start')]
+        ))
+
+        self.assertEqual(report.cost, 1 + 1 + 2)
+
+    def test_unbounded_fields_should_be_flagged(self):
+        report = analyze(DictField(
+            schema={
+                'name': StrField(),
+                'tags': ListField(item_schema=StrField(max_length=10))
+            }
+        ))
+
+        self.assertEqual(report.cost, float('inf'))
+        self.assertEqual(report.as_list(), [
+            {'code': 'UNBOUNDED_STRING', 'path': '$root.name', 'extra': None},
+            {'code': 'UNBOUNDED_LIST', 'path': '$root.tags', 'extra': None}
+        ])
+
+    def test_or_cost_should_sum_branches_and_flag_nested_unions(self):
+        report = analyze(OrField(
+            schemas=[
+                IntField(),
+                DictField(
+                    schema={
+                        'a': OrField(schemas=[IntField(), StrField(max_length=1)]),
+                        'b': OrField(schemas=[IntField(), UUIDField()])
+                    }
+                )
+            ]
+        ), max_string_length=100)
+
+        self.assertEqual(report.cost, 1 + 1 + (1 + 3 + (1 + 1 + 101)))
+        self.assertEqual(report.as_list(), [{'code': 'NESTED_UNION', 'path': '$root', 'extra': {'fanout': 5}}])
+
+    def test_backtracking_regexes_should_be_flagged(self):
+        report = analyze(DictField(
+            schema={
+                'email': RegexField(regex='^([a-z0-9_.+-]+)+@example\\.com\\Z'),
+                'pair': RegexField(regex='\\d+\\d+\\Z')
+            }
+        ), max_string_length=100)
+
+        self.assertEqual([(issue.code, issue.path) for issue in report.issues], [
+            ('UNBOUNDED_STRING', '$root.email'),
+            ('REGEX_EXPONENTIAL_BACKTRACKING', '$root.email'),
+            ('UNBOUNDED_STRING', '$root.pair'),
+            ('REGEX_POLYNOMIAL_BACKTRACKING', '$root.pair')
+        ])
+        self.assertEqual(report.costs['$root.pair'], 1 + 100 ** 2)
+
+    def test_polynomial_cost_should_use_the_degree(self):
+        report = analyze(RegexField(regex='^(.*,){3}P'), max_string_length=100)
+
+        self.assertEqual(report.as_list()[-1], {
+            'code': 'REGEX_POLYNOMIAL_BACKTRACKING',
+            'path': '$root',
+            'extra': {'regex': '^(.*,){3}P', 'degree': 3}
+        })
+        self.assertEqual(report.cost, 1 + 100 ** 3)
+
+    def test_budget_should_be_checked(self):
+        schema = ListField(max_items=1000, item_schema=RegexField(regex='[a-z]{50}\\Z'))
+
+        self.assertFalse(analyze(schema, budget=100000).exceeds_budget)
+
+        report = analyze(schema, budget=10000)
+
+        self.assertTrue(report.exceeds_budget)
+        self.assertEqual(report.issues[-1].code, 'COST_BUDGET_EXCEEDED')
+
+    def test_regex_union_should_cost_a_single_scan(self):
+        schema = optimize(OrField(
+            schemas=[
+                RegexField(regex='[0-9]{3}\\.?[0-9]{3}\\.?[0-9]{3}\\-?[0-9]{2}\\Z'),
+                RegexField(regex='[0-9]{2}\\.?[0-9]{3}\\.?[0-9]{3}\\/?[0-9]{4}\\-?[0-9]{2}\\Z')
+            ]
+        ))
+
+        self.assertEqual(analyze(schema).cost, 1 + 18)
@@ -0,0 +1,269 @@
+import csv
+import io
+import os
+from collections import deque
+from itertools import islice
+from multiprocessing import Pool
+
+from .py_schema import SchemaValidator, SchemaValidationError, \
+    IntField, FloatField, BoolField, DictField, ListField, EnumField
+
+
+def _coerce_int(cell: str):
+    try:
+        return int(cell)
+    except ValueError:
+        return cell
+
+
+def _coerce_float(cell: str):
+    try:
+        return float(cell)
+    except ValueError:
+        return cell
+
+
+class _EnumCoercer:
+    def __init__(self, accept: [any]):
+        self.accept = {str(accept_value): accept_value for accept_value in accept}
+
+    def __call__(self, cell: str):
+        return self.accept.get(cell, cell)
+
+
+class CsvValidator:
+    """
+    Validates the rows of a CSV (or TSV) file against a flat DictField schema,
+    one row at a time.
+
+    The header is mapped to the schema props once, the cells of IntField, FloatField,
+    BoolField and EnumField props are converted from strings before the validation.
+    Empty cells are handled as missing props.
+    """
+
+    def __init__(self, schema: DictField, true_values=('true', '1'), false_values=('false', '0'), **fmtparams):
+        for key, field in schema.schema.items():
+            if isinstance(field, (DictField, ListField)):
+                raise ValueError('the prop "{}" is not flat, only flat DictField schemas are supported'.format(key))
+
+        self.schema = schema
+        self.true_values = frozenset(true_values)
+        self.false_values = frozenset(false_values)
+        self.fmtparams = fmtparams
+        self.summary = self.empty_summary()
+
+    @staticmethod
+    def empty_summary() -> dict:
+        return {
+            'rows': 0,
+            'valid_rows': 0,
+            'invalid_rows': 0
+        }
+
+    def coerce_bool(self, cell: str):
+        lower_cell = cell.lower()
+
+        if lower_cell in self.true_values:
+            return True
+
+        if lower_cell in self.false_values:
+            return False
+
+        return cell
+
+    def coercer(self, field):
+        if isinstance(field, IntField):
+            return _coerce_int
+
+        if isinstance(field, FloatField):
+            return _coerce_float
+
+        if isinstance(field, BoolField):
+            return self.coerce_bool
+
+        if isinstance(field, EnumField):
+            return _EnumCoercer(field.accept)
+
+        return None
+
+    def map_header(self, header: [str]):
+        """
+        Returns the header errors and a list of (column index, prop, coercer, optional).
+        """
+        schema = self.schema
+        errors = []
+        columns = []
+
+        for index, column in enumerate(header):
+            if column in schema.schema:
+                columns.append((
+                    index,
+                    column,
+                    self.coercer(schema.schema[column]),
+                    column in schema.optional_props
+                ))
+            elif schema.strict and column not in schema.optional_props:
+                errors.append(self.header_error('DICT_PROP_NOT_ALLOWED', column))
+
+        for prop in schema.schema:
+            if prop not in header and prop not in schema.optional_props:
+                errors.append(self.header_error('DICT_PROP_MISSING', prop))
+
+        return errors, columns
+
+    @staticmethod
+    def header_error(code: str, column: str) -> dict:
+        return {
+            'row': 0,
+            'line': 1,
+            'column': column,
+            'code': code,
+            'path': '$root',
+            'extra': {'prop': column}
+        }
+
+    def validate(self, file):
+        """
+        Yields an error record for each invalid row of `file` (a text file object or any
+        iterable of lines), the counters are updated in `self.summary`.
+        """
+        self.summary = self.empty_summary()
+
+        reader = csv.reader(file, **self.fmtparams)
+
+        try:
+            header = next(reader)
+        except StopIteration:
+            return
+
+        header_errors, columns = self.map_header(header)
+
+        if header_errors:
+            yield from header_errors
+            return
+
+        yield from self.validate_rows(reader, columns, self.summary)
+
+    def validate_rows(self, reader, columns, summary: dict):
+        schema = self.schema
+        row_number = 0
+
+        for row in reader:
+            row_number += 1
+            row_length = len(row)
+            value = {}
+
+            for index, prop, coerce, optional in columns:
+                cell = row[index] if index < row_length else ''
+
+                if cell == '':
+                    if not optional:
+                        value[prop] = None
+                elif coerce is None:
+                    value[prop] = cell
+                else:
+                    value[prop] = coerce(cell)
+
+            summary['rows'] += 1
+
+            try:
+                SchemaValidator(schema, value).validate()
+                summary['valid_rows'] += 1
+            except SchemaValidationError as err:
+                summary['invalid_rows'] += 1
+
+                path_items = err.path_items
+                column = path_items[1] if len(path_items) > 1 else (err.extra or {}).get('prop')
+
+                yield {
+                    'row': row_number,
+                    'line': reader.line_num,
+                    'column': column,
+                    'code': err.code,
+                    'path': err.path,
+                    'extra': err.extra
+                }
+
+    def validate_path(self, path: str, processes: int = None, chunk_size: int = 64 * 1024 * 1024,
+                      encoding: str = 'utf-8', max_chunk_errors: int = 10000):
+        """
+        Like `validate`, but the file is split in chunks of about `chunk_size` bytes
+        validated by a pool of `processes` workers. The error records are yielded in the
+        file order.
+
+        The memory is bounded: at most 2 chunks per worker are in flight, and only the first
+        `max_chunk_errors` error records of each chunk are kept (None for all of them), the others
+        are counted in `summary['dropped_errors']`.
+
+        The chunks are split at line breaks, so the quoted cells can't contain line breaks.
+        """
+        self.summary = self.empty_summary()
+        self.summary['dropped_errors'] = 0
+
+        with open(path, 'rb') as file:
+            header_line = file.readline()
+            header = next(csv.reader([header_line.decode(encoding)], **self.fmtparams), [])
+
+            header_errors, columns = self.map_header(header)
+
+            if header_errors:
+                yield from header_errors
+                return
+
+            chunks = []
+            start = file.tell()
+            size = os.fstat(file.fileno()).st_size
+
+            while start < size:
+                file.seek(min(start + chunk_size, size))
+                file.readline()
+
+                end = file.tell()
+                chunks.append((self, path, start, end, encoding, columns, max_chunk_errors))
+                start = end
+
+        row_offset = 0
+        line_offset = 1
+
+        with Pool(processes) as pool:
+            # unlike imap, the results waiting for the consumer can't pile up
+            chunks = iter(chunks)
+            pending = deque(
+                pool.apply_async(_validate_chunk, (chunk,))
+                for chunk in islice(chunks, 2 * (processes or os.cpu_count() or 1))
+            )
+
+            while pending:
+                summary, lines, errors = pending.popleft().get()
+
+                for chunk in islice(chunks, 1):
+                    pending.append(pool.apply_async(_validate_chunk, (chunk,)))
+
+                for error in errors:
+                    error['row'] += row_offset
+                    error['line'] += line_offset
+
+                    yield error
+
+                row_offset += summary['rows']
+                line_offset += lines
+
+                for key in summary:
+                    self.summary[key] += summary[key]
+
+
+def _validate_chunk(args):
+    validator, path, start, end, encoding, columns, max_errors = args
+
+    with open(path, 'rb') as file:
+        file.seek(start)
+        text = file.read(end - start).decode(encoding)
+
+    summary = CsvValidator.empty_summary()
+    reader = csv.reader(io.StringIO(text), **validator.fmtparams)
+    records = validator.validate_rows(reader, columns, summary)
+    errors = list(islice(records, max_errors))
+
+    summary['dropped_errors'] = sum(1 for _ in records)
+
+    return summary, reader.line_num, errors
@@ -0,0 +1,158 @@
+import io
+import os
+import tempfile
+from unittest import TestCase
+
+from py_schema import IntField, StrField, BoolField, FloatField, DictField, ListField, EnumField
+from py_schema.csv_validator import CsvValidator
+
+
+CSV = '''name,age,money,admin,level
+Bruce,40,10.5,true,1
+Clark,abc,,false,2
+Diana,30,,TRUE,4
+Barry,,1.0,0,3
+'''
+
+
+class CsvValidatorTest(TestCase):
+    def test_rows_should_be_validated(self):
+        schema = DictField(
+            schema={
+                'name': StrField(min_length=2),
+                'age': IntField(min=0),
+                'money': FloatField(),
+                'admin': BoolField(),
+                'level': EnumField(accept=[1, 2, 3])
+            },
+            optional_props=['money'],
+            strict=True
+        )
+
+        validator = CsvValidator(schema)
+
+        errors = list(validator.validate(io.StringIO(CSV)))
+
+        self.assertEqual(
+            [(error['row'], error['line'], error['column'], error['code']) for error in errors],
+            [
+                (2, 3, 'age', 'INT_TYPE'),
+                (3, 4, 'level', 'ENUM_VALUE_NOT_ACCEPT'),
+                (4, 5, 'age', 'REQUIRED_VALUE')
+            ]
+        )
+        self.assertEqual(
+            validator.summary,
+            {'rows': 4, 'valid_rows': 1, 'invalid_rows': 3}
+        )
+
+    def test_tsv_should_be_validated(self):
+        schema = DictField(
+            schema={
+                'name': StrField(min_length=2),
+                'age': IntField(min=0),
+                'money': FloatField(),
+                'admin': BoolField(),
+                'level': EnumField(accept=[1, 2, 3])
+            },
+            optional_props=['money'],
+            strict=True
+        )
+
+        validator = CsvValidator(schema, delimiter='\t')
+
+        errors = list(validator.validate(io.StringIO(CSV.replace(',', '\t'))))
+
+        self.assertEqual(len(errors), 3)
+
+    def test_invalid_header_should_raise_header_errors(self):
+        schema = DictField(
+            schema={
+                'name': StrField(min_length=2),
+                'age': IntField(min=0),
+                'money': FloatField(),
+                'admin': BoolField(),
+                'level': EnumField(accept=[1, 2, 3])
+            },
+            optional_props=['money'],
+            strict=True
+        )
+
+        validator = CsvValidator(schema)
+
+        errors = list(validator.validate(io.StringIO('name,age,admin,other\nBruce,40,true,x\n')))
+
+        self.assertEqual(
+            [(error['row'], error['column'], error['code']) for error in errors],
+            [
+                (0, 'other', 'DICT_PROP_NOT_ALLOWED'),
+                (0, 'level', 'DICT_PROP_MISSING')
+            ]
+        )
+        self.assertEqual(validator.summary['rows'], 0)
+
+    def test_nested_schema_should_raise_error(self):
+        with self.assertRaises(ValueError):
+            CsvValidator(DictField(schema={'tags': ListField(item_schema=StrField())}))
+
+    def test_chunks_should_be_validated_in_order(self):
+        schema = DictField(
+            schema={
+                'name': StrField(min_length=2),
+                'age': IntField(min=0),
+                'money': FloatField(),
+                'admin': BoolField(),
+                'level': EnumField(accept=[1, 2, 3])
+            },
+            optional_props=['money'],
+            strict=True
+        )
+
+        lines = ['name,age,money,admin,level']
+
+        for index in range(1000):
+            lines.append('Bruce,{},,true,{}'.format(-1 if index % 100 == 0 else index, 1 + index % 3))
+
+        fd, path = tempfile.mkstemp(suffix='.csv')
+
+        try:
+            with os.fdopen(fd, 'w') as file:
+                file.write('\n'.join(lines))
+
+            validator = CsvValidator(schema)
+            errors = list(validator.validate_path(path, processes=2, chunk_size=2048))
+        finally:
+            os.remove(path)
+
+        self.assertEqual(
+            [error['row'] for error in errors],
+            list(range(1, 1001, 100))
+        )
+        self.assertEqual(
+            [error['line'] for error in errors],
+            list(range(2, 1002, 100))
+        )
+        self.assertEqual(
+            validator.summary,
+            {'rows': 1000, 'valid_rows': 990, 'invalid_rows': 10, 'dropped_errors': 0}
+        )
+
+    def test_chunk_errors_should_be_capped(self):
+        schema = DictField(schema={'age': IntField(min=0)})
+        lines = ['age'] + ['-1'] * 1000
+
+        fd, path = tempfile.mkstemp(suffix='.csv')
+
+        try:
+            with os.fdopen(fd, 'w') as file:
+                file.write('\n'.join(lines))
+
+            validator = CsvValidator(schema)
+            errors = list(validator.validate_path(path, processes=2, chunk_size=1024, max_chunk_errors=3))
+        finally:
+            os.remove(path)
+
+        # the first 3 errors of each chunk, a chunk ends at the line break after 1024 bytes (342 rows)
+        self.assertEqual([error['row'] for error in errors], [1, 2, 3, 343, 344, 345, 685, 686, 687])
+        self.assertEqual(validator.summary['invalid_rows'], 1000)
+        self.assertEqual(validator.summary['dropped_errors'], 1000 - 9)
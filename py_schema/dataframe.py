@@ -0,0 +1,359 @@
+from .py_schema import SchemaValidator, SchemaValidationError, \
+    IntField, FloatField, StrField, BoolField, DictField, ListField, EnumField
+
+
+class _PandasColumns:
+    def __init__(self, frame):
+        import pandas
+
+        self.pandas = pandas
+        self.frame = frame
+
+    def names(self) -> list:
+        return [str(name) for name in self.frame.columns]
+
+    def column(self, name: str):
+        return self.frame[name]
+
+    def null_mask(self, column):
+        return column.isna().to_numpy(dtype=bool)
+
+    def kind(self, column) -> str:
+        inferred = self.pandas.api.types.infer_dtype(column, skipna=True)
+
+        return {
+            'integer': 'int',
+            'floating': 'float',
+            'boolean': 'bool',
+            'string': 'str',
+            'empty': 'empty'
+        }.get(inferred, 'object')
+
+    @staticmethod
+    def mask(values):
+        return values.to_numpy(dtype=bool, na_value=False)
+
+    def less(self, values, bound):
+        return self.mask(values < bound)
+
+    def greater(self, values, bound):
+        return self.mask(values > bound)
+
+    def not_integral(self, column):
+        import numpy
+
+        numbers = self.pandas.to_numeric(column)
+
+        return self.mask(~numpy.isfinite(numbers) | (numbers != numbers.round()))
+
+    def str_lengths(self, column):
+        return column.str.len()
+
+    def isin(self, column, values: list):
+        return column.isin(values).to_numpy(dtype=bool)
+
+    def cells(self, column) -> list:
+        return column.tolist()
+
+
+class _ArrowColumns:
+    def __init__(self, table):
+        import pyarrow
+        import pyarrow.compute
+
+        self.pyarrow = pyarrow
+        self.compute = pyarrow.compute
+        self.table = table
+
+    def names(self) -> list:
+        return list(self.table.column_names)
+
+    def column(self, name: str):
+        return self.table.column(name)
+
+    def null_mask(self, column):
+        return column.is_null().to_numpy()
+
+    def kind(self, column) -> str:
+        types = self.pyarrow.types
+        column_type = column.type
+
+        if types.is_null(column_type):
+            return 'empty'
+
+        if types.is_integer(column_type):
+            return 'int'
+
+        if types.is_floating(column_type):
+            return 'float'
+
+        if types.is_boolean(column_type):
+            return 'bool'
+
+        if types.is_string(column_type) or types.is_large_string(column_type):
+            return 'str'
+
+        return 'object'
+
+    def mask(self, values):
+        return self.compute.fill_null(values, False).to_numpy(zero_copy_only=False)
+
+    def less(self, values, bound):
+        return self.mask(self.compute.less(values, bound))
+
+    def greater(self, values, bound):
+        return self.mask(self.compute.greater(values, bound))
+
+    def not_integral(self, column):
+        compute = self.compute
+
+        return self.mask(compute.or_(
+            compute.invert(compute.is_finite(column)),
+            compute.not_equal(column, compute.round(column))
+        ))
+
+    def str_lengths(self, column):
+        return self.compute.utf8_length(column)
+
+    def isin(self, column, values: list):
+        try:
+            return self.mask(self.compute.is_in(column, value_set=self.pyarrow.array(values)))
+        except (self.pyarrow.ArrowInvalid, self.pyarrow.ArrowNotImplementedError, self.pyarrow.ArrowTypeError):
+            # the accepted values don't have the column type
+            import numpy
+
+            return numpy.array([cell in values for cell in column.to_pylist()], dtype=bool)
+
+    def cells(self, column) -> list:
+        return column.to_pylist()
+
+
+def _columns(table):
+    module = type(table).__module__.split('.')[0]
+
+    if module == 'pandas':
+        return _PandasColumns(table)
+
+    if module == 'pyarrow':
+        return _ArrowColumns(table)
+
+    raise TypeError('expected a pandas DataFrame or a pyarrow Table, got {}'.format(type(table).__name__))
+
+
+class TableValidator:
+    """
+    Validates the rows of a pandas DataFrame or a pyarrow Table against a flat DictField schema,
+    one column at a time, without converting the rows to dicts.
+
+    The IntField, FloatField, StrField, BoolField and EnumField constraints are checked with
+    vectorized predicates on the column, the other fields (and the columns of mixed types) are
+    validated cell by cell. The nulls are missing props for the `optional_props`.
+    """
+
+    def __init__(self, schema: DictField):
+        for key, field in schema.schema.items():
+            if isinstance(field, (DictField, ListField)):
+                raise ValueError('the prop "{}" is not flat, only flat DictField schemas are supported'.format(key))
+
+        if schema.rules:
+            raise ValueError('the DictField rules are not supported')
+
+        self.schema = schema
+
+    def validate(self, table, max_errors: int = None) -> [SchemaValidationError]:
+        """
+        Returns the errors of the table, sorted by row and by column in the schema order,
+        with the paths of a `ListField(item_schema=schema)` (ex: `$root.$12.age`).
+
+        Unlike the `DictField`, every invalid cell of a row is reported. The missing and not allowed
+        columns are reported once, with `$*` as the row.
+        """
+        columns = _columns(table)
+
+        import numpy
+
+        schema = self.schema
+        names = columns.names()
+        errors = []
+
+        for prop in schema.schema:
+            if prop not in names and prop not in schema.optional_props:
+                errors.append(self.table_error('DICT_PROP_MISSING', prop))
+
+        if schema.strict:
+            for name in names:
+                if name not in schema.schema and name not in schema.optional_props:
+                    errors.append(self.table_error('DICT_PROP_NOT_ALLOWED', name))
+
+        # (rows, column position, prop, field, code, extras) of each group of failing cells
+        failures = []
+
+        for position, (prop, field) in enumerate(schema.schema.items()):
+            if prop in names:
+                for rows, code, extras in self.validate_column(columns, columns.column(prop), prop, field):
+                    failures.append((numpy.asarray(rows, dtype=numpy.int64), position, prop, field, code, extras))
+
+        if not failures:
+            return errors
+
+        sizes = [len(failure[0]) for failure in failures]
+        rows = numpy.concatenate([failure[0] for failure in failures])
+        groups = numpy.repeat(numpy.arange(len(failures)), sizes)
+        offsets = numpy.arange(len(rows)) - numpy.repeat(numpy.cumsum(sizes) - sizes, sizes)
+        positions = numpy.array([failure[1] for failure in failures])[groups]
+
+        order = numpy.lexsort((positions, rows))
+
+        if max_errors is not None:
+            order = order[:max(max_errors - len(errors), 0)]
+
+        for index in order.tolist():
+            _, _, prop, field, code, extras = failures[groups[index]]
+
+            errors.append(SchemaValidationError(
+                code=code,
+                path=('$root', '${}'.format(rows[index]), prop),
+                node=field,
+                extra=extras[offsets[index]] if extras is not None else None
+            ))
+
+        return errors
+
+    @staticmethod
+    def table_error(code: str, prop: str) -> SchemaValidationError:
+        return SchemaValidationError(
+            code=code,
+            path=('$root', '$*'),
+            node=None,
+            extra={'prop': prop}
+        )
+
+    def validate_column(self, columns, column, prop: str, field):
+        """
+        Yields (rows, code, extras) for each error of the column, `extras` is None or
+        the list of the errors extra.
+        """
+        import numpy
+
+        nulls = columns.null_mask(column)
+        present = ~nulls
+
+        if nulls.any() and prop not in self.schema.optional_props:
+            # all the nulls fail (or pass) the same way
+            try:
+                SchemaValidator(field, None).validate()
+            except SchemaValidationError as err:
+                null_rows = numpy.flatnonzero(nulls)
+
+                yield null_rows, err.code, [err.extra] * len(null_rows) if err.extra is not None else None
+
+        if not present.any():
+            return
+
+        checks = self.vectorized_checks(columns, column, field)
+
+        if checks is None:
+            yield from self.validate_cells(columns.cells(column), present, field)
+            return
+
+        # only the first failing check of each cell is reported, like the fields
+        failed = nulls
+
+        for code, check in checks:
+            mask = check() & ~failed
+
+            if mask.any():
+                yield numpy.flatnonzero(mask), code, None
+
+                failed = failed | mask
+
+    @staticmethod
+    def validate_cells(cells: list, present, field):
+        errors = {}
+
+        for row in present.nonzero()[0].tolist():
+            try:
+                SchemaValidator(field, cells[row]).validate()
+            except SchemaValidationError as err:
+                errors.setdefault(err.code, []).append((row, err.extra))
+
+        for code, rows in errors.items():
+            yield [row for row, _ in rows], code, [extra for _, extra in rows]
+
+    def vectorized_checks(self, columns, column, field):
+        """
+        Returns a list of (code, function returning the mask of the failing rows), or None
+        if the column must be validated cell by cell.
+        """
+        kind = columns.kind(column)
+        field_type = type(field)
+
+        if kind == 'empty':
+            return []
+
+        if field_type is EnumField:
+            try:
+                hash(tuple(field.accept))
+            except TypeError:
+                return None
+
+            return [('ENUM_VALUE_NOT_ACCEPT', lambda: ~columns.isin(column, list(field.accept)))]
+
+        if kind == 'object':
+            return None
+
+        def all_rows():
+            return ~columns.null_mask(column)
+
+        if field_type is IntField:
+            if kind not in ('int', 'float'):
+                return [('INT_TYPE', all_rows)]
+
+            checks = []
+
+            if kind == 'float':
+                # the int columns with nulls are usually stored as floats, only their fractions and
+                # non-finite values are rejected, the float columns without nulls are floats
+                if not columns.null_mask(column).any():
+                    return [('INT_TYPE', all_rows)]
+
+                checks.append(('INT_TYPE', lambda: columns.not_integral(column)))
+
+            return checks + self.range_checks(columns, column, 'INT_MIN', field.min, 'INT_MAX', field.max)
+
+        if field_type is FloatField:
+            # like the FloatField, the ints are rejected
+            if kind != 'float':
+                return [('FLOAT_TYPE', all_rows)]
+
+            return self.range_checks(columns, column, 'FLOAT_MIN', field.min, 'FLOAT_MAX', field.max)
+
+        if field_type is StrField:
+            if kind != 'str':
+                return [('STR_TYPE', all_rows)]
+
+            if field.min_length is None and field.max_length is None:
+                return []
+
+            return self.range_checks(
+                columns, columns.str_lengths(column),
+                'STR_MIN_LENGTH', field.min_length,
+                'STR_MAX_LENGTH', field.max_length
+            )
+
+        if field_type is BoolField:
+            return [] if kind == 'bool' else [('BOOL_TYPE', all_rows)]
+
+        return None
+
+    @staticmethod
+    def range_checks(columns, values, min_code: str, min_value, max_code: str, max_value) -> list:
+        checks = []
+
+        if min_value is not None:
+            checks.append((min_code, lambda: columns.less(values, min_value)))
+
+        if max_value is not None:
+            checks.append((max_code, lambda: columns.greater(values, max_value)))
+
+        return checks
@@ -0,0 +1,251 @@
+from unittest import TestCase, skipUnless
+
+from py_schema import SchemaValidator, SchemaValidationError, \
+    IntField, FloatField, StrField, BoolField, DictField, ListField, EnumField, RegexField, Compare
+from py_schema.dataframe import TableValidator
+
+try:
+    import pandas
+except ImportError:
+    pandas = None
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+
+ROWS = {
+    'id': [1, 0, 3, None],
+    'name': ['ab', 'a', 'abcdefg', 'xy'],
+    'score': [1.0, 11.0, None, 3.0],
+    'alive': [True, False, True, True],
+    'gender': ['M', 'X', 'F', None],
+    'zip': ['12345', '1234', None, '00000'],
+    'nick': [None, 'ab', None, None]
+}
+
+EXPECTED_ERRORS = [
+    ('INT_MIN', '$root.$1.id'),
+    ('STR_MIN_LENGTH', '$root.$1.name'),
+    ('FLOAT_MAX', '$root.$1.score'),
+    ('ENUM_VALUE_NOT_ACCEPT', '$root.$1.gender'),
+    ('REGEX_NOT_MATCH', '$root.$1.zip'),
+    ('STR_MAX_LENGTH', '$root.$2.name'),
+    ('REQUIRED_VALUE', '$root.$2.score'),
+    ('REQUIRED_VALUE', '$root.$2.zip'),
+    ('REQUIRED_VALUE', '$root.$3.id'),
+    ('REQUIRED_VALUE', '$root.$3.gender')
+]
+
+
+def errors(schema, table, **kwargs) -> list:
+    return [(error.code, error.path) for error in TableValidator(schema).validate(table, **kwargs)]
+
+
+@skipUnless(pandas, 'pandas is not installed')
+class PandasTableValidatorTest(TestCase):
+    def test_invalid_cells_should_be_reported_with_list_paths(self):
+        schema = DictField(
+            schema={
+                'id': IntField(min=1),
+                'name': StrField(min_length=2, max_length=5),
+                'score': FloatField(max=10.0),
+                'alive': BoolField(),
+                'gender': EnumField(accept=['M', 'F']),
+                'zip': RegexField(regex='\\d{5}\\Z'),
+                'nick': StrField()
+            },
+            optional_props=['nick'],
+            strict=True
+        )
+
+        self.assertEqual(errors(schema, pandas.DataFrame(ROWS)), EXPECTED_ERRORS)
+
+    def test_first_error_of_each_row_should_match_row_validation(self):
+        schema = DictField(
+            schema={
+                'id': IntField(min=1),
+                'name': StrField(min_length=2, max_length=5),
+                'score': FloatField(max=10.0),
+                'alive': BoolField(),
+                'gender': EnumField(accept=['M', 'F']),
+                'zip': RegexField(regex='\\d{5}\\Z'),
+                'nick': StrField()
+            },
+            optional_props=['nick'],
+            strict=True
+        )
+        table_errors = TableValidator(schema).validate(pandas.DataFrame(ROWS))
+
+        for row in range(4):
+            value = {key: values[row] for key, values in ROWS.items() if key != 'nick' or values[row] is not None}
+            row_path = '$root.${}'.format(row)
+            row_errors = [error for error in table_errors if error.path.startswith(row_path + '.')]
+
+            try:
+                SchemaValidator(ListField(item_schema=schema), [value]).validate()
+                self.assertEqual(row_errors, [])
+            except SchemaValidationError as e:
+                self.assertEqual(row_errors[0].code, e.code)
+                self.assertEqual(row_errors[0].path, e.path.replace('$root.$0', row_path))
+
+    def test_column_types_should_be_checked(self):
+        schema = DictField(
+            schema={
+                'id': IntField(min=1),
+                'name': StrField(min_length=2, max_length=5),
+                'score': FloatField(max=10.0),
+                'alive': BoolField(),
+                'gender': EnumField(accept=['M', 'F']),
+                'zip': RegexField(regex='\\d{5}\\Z'),
+                'nick': StrField()
+            },
+            optional_props=['nick'],
+            strict=True
+        )
+
+        frame = pandas.DataFrame({
+            'id': ['1', '2'],
+            'name': [1, 2],
+            'score': [1, 2],
+            'alive': [1, 0],
+            'gender': ['M', 'F'],
+            'zip': ['12345', '1234']
+        })
+
+        self.assertEqual(errors(schema, frame), [
+            ('INT_TYPE', '$root.$0.id'),
+            ('STR_TYPE', '$root.$0.name'),
+            ('FLOAT_TYPE', '$root.$0.score'),
+            ('BOOL_TYPE', '$root.$0.alive'),
+            ('INT_TYPE', '$root.$1.id'),
+            ('STR_TYPE', '$root.$1.name'),
+            ('FLOAT_TYPE', '$root.$1.score'),
+            ('BOOL_TYPE', '$root.$1.alive'),
+            ('REGEX_NOT_MATCH', '$root.$1.zip')
+        ])
+
+    def test_int_columns_stored_as_floats_should_reject_fractions(self):
+        frame = pandas.DataFrame({'id': [1.0, None, 2.5]})
+        schema = DictField(schema={'id': IntField()}, optional_props=['id'])
+
+        self.assertEqual(errors(schema, frame), [('INT_TYPE', '$root.$2.id')])
+
+    def test_float_columns_without_nulls_should_not_be_ints(self):
+        schema = DictField(schema={'id': IntField()})
+
+        self.assertEqual(errors(schema, pandas.DataFrame({'id': [1.0, 2.0]})), [
+            ('INT_TYPE', '$root.$0.id'),
+            ('INT_TYPE', '$root.$1.id')
+        ])
+
+    def test_non_finite_values_should_not_be_ints(self):
+        frame = pandas.DataFrame({'id': [float('inf'), 2.0, None, float('-inf')]})
+        schema = DictField(schema={'id': IntField()}, optional_props=['id'])
+
+        self.assertEqual(errors(schema, frame), [('INT_TYPE', '$root.$0.id'), ('INT_TYPE', '$root.$3.id')])
+
+    def test_int_cells_should_not_be_floats(self):
+        frame = pandas.DataFrame({'score': pandas.Series([1.5, 2], dtype=object)})
+        schema = DictField(schema={'score': FloatField()})
+
+        self.assertEqual(errors(schema, frame), [('FLOAT_TYPE', '$root.$1.score')])
+
+    def test_columns_should_be_checked_once(self):
+        schema = DictField(
+            schema={
+                'id': IntField(min=1),
+                'name': StrField(min_length=2, max_length=5),
+                'score': FloatField(max=10.0),
+                'alive': BoolField(),
+                'gender': EnumField(accept=['M', 'F']),
+                'zip': RegexField(regex='\\d{5}\\Z'),
+                'nick': StrField()
+            },
+            optional_props=['nick'],
+            strict=True
+        )
+
+        frame = pandas.DataFrame({'id': [1], 'other': [2]})
+
+        self.assertEqual(errors(schema, frame), [
+            ('DICT_PROP_MISSING', '$root.$*'),
+            ('DICT_PROP_MISSING', '$root.$*'),
+            ('DICT_PROP_MISSING', '$root.$*'),
+            ('DICT_PROP_MISSING', '$root.$*'),
+            ('DICT_PROP_MISSING', '$root.$*'),
+            ('DICT_PROP_NOT_ALLOWED', '$root.$*')
+        ])
+
+    def test_max_errors_should_keep_the_first_errors(self):
+        schema = DictField(
+            schema={
+                'id': IntField(min=1),
+                'name': StrField(min_length=2, max_length=5),
+                'score': FloatField(max=10.0),
+                'alive': BoolField(),
+                'gender': EnumField(accept=['M', 'F']),
+                'zip': RegexField(regex='\\d{5}\\Z'),
+                'nick': StrField()
+            },
+            optional_props=['nick'],
+            strict=True
+        )
+
+        self.assertEqual(errors(schema, pandas.DataFrame(ROWS), max_errors=3), EXPECTED_ERRORS[:3])
+
+    def test_nested_schemas_should_not_be_supported(self):
+        with self.assertRaises(ValueError):
+            TableValidator(DictField(schema={'tags': ListField(item_schema=StrField())}))
+
+
+@skipUnless(pyarrow, 'pyarrow is not installed')
+class ArrowTableValidatorTest(TestCase):
+    def test_invalid_cells_should_be_reported_with_list_paths(self):
+        schema = DictField(
+            schema={
+                'id': IntField(min=1),
+                'name': StrField(min_length=2, max_length=5),
+                'score': FloatField(max=10.0),
+                'alive': BoolField(),
+                'gender': EnumField(accept=['M', 'F']),
+                'zip': RegexField(regex='\\d{5}\\Z'),
+                'nick': StrField()
+            },
+            optional_props=['nick'],
+            strict=True
+        )
+
+        self.assertEqual(errors(schema, pyarrow.table(ROWS)), EXPECTED_ERRORS)
+
+    def test_int_fields_should_only_accept_whole_floats_with_nulls(self):
+        schema = DictField(schema={'id': IntField()}, optional_props=['id'])
+
+        self.assertEqual(errors(schema, pyarrow.table({'id': [float('inf'), 2.0]})), [
+            ('INT_TYPE', '$root.$0.id'),
+            ('INT_TYPE', '$root.$1.id')
+        ])
+        self.assertEqual(errors(schema, pyarrow.table({'id': [float('inf'), 2.0, None, 2.5]})), [
+            ('INT_TYPE', '$root.$0.id'),
+            ('INT_TYPE', '$root.$3.id')
+        ])
+
+    def test_enum_values_of_other_types_should_not_match(self):
+        schema = DictField(schema={'level': EnumField(accept=['low', 1])})
+
+        self.assertEqual(errors(schema, pyarrow.table({'level': [1, 2]})), [
+            ('ENUM_VALUE_NOT_ACCEPT', '$root.$1.level')
+        ])
+
+
+class TableValidatorTest(TestCase):
+    def test_rules_should_not_be_supported(self):
+        with self.assertRaises(ValueError):
+            TableValidator(DictField(schema={'a': IntField(), 'b': IntField()}, rules=[Compare('b', '>', 'a')]))
+
+    def test_other_tables_should_not_be_supported(self):
+        schema = DictField(schema={'id': IntField()})
+
+        with self.assertRaises(TypeError):
+            TableValidator(schema).validate([{'id': 1}])
@@ -0,0 +1,631 @@
+import copy
+import datetime
+import ipaddress
+import json
+import random
+import re
+import string
+import uuid
+
+try:
+    import re._parser as sre_parse
+except ImportError:  # python < 3.11
+    import sre_parse
+
+from .py_schema import SchemaValidator, SchemaValidationError, \
+    IntField, FloatField, StrField, BoolField, DictField, ListField, \
+    EnumField, RegexField, OrField, FormatField, UUIDField, DateTimeField, DateField, EmailField, \
+    IPField, URIField
+
+_DIGITS = string.digits
+_WORD = string.ascii_letters + string.digits + '_'
+_SPACE = ' \t\n'
+_PRINTABLE = string.ascii_letters + string.digits + string.punctuation + ' '
+
+_CATEGORY_CHARS = {
+    sre_parse.CATEGORY_DIGIT: _DIGITS,
+    sre_parse.CATEGORY_NOT_DIGIT: ''.join(c for c in _PRINTABLE if c not in _DIGITS),
+    sre_parse.CATEGORY_WORD: _WORD,
+    sre_parse.CATEGORY_NOT_WORD: ''.join(c for c in _PRINTABLE if c not in _WORD),
+    sre_parse.CATEGORY_SPACE: _SPACE,
+    sre_parse.CATEGORY_NOT_SPACE: ''.join(c for c in _PRINTABLE if c not in _SPACE),
+}
+
+# the values tried to create a value that matches none of the OrField branches
+_PROBE_VALUES = ['', '~', 0, -1, 1.5, True, {}, [], ['~'], {'~': '~'}]
+
+# the dicts generated to find one that passes (or breaks) the DictField rules
+_RULE_ATTEMPTS = 100
+
+
+class _RegexCompiler:
+    """
+    Compiles a regex (a subset: literals, classes, groups, alternations, repeats and
+    group references) to a function that returns a string matching it.
+    """
+
+    def __init__(self, rnd: random.Random, max_repeat: int):
+        self.random = rnd
+        self.max_repeat = max_repeat
+
+    def compile(self, pattern):
+        if not isinstance(pattern, str):
+            pattern = pattern.pattern
+
+        return self.compile_sequence(sre_parse.parse(pattern))
+
+    def compile_sequence(self, items):
+        parts = [self.compile_item(op, av) for op, av in items]
+
+        def generate(groups):
+            return ''.join([part(groups) for part in parts])
+
+        return generate
+
+    def compile_item(self, op, av):
+        rnd = self.random
+
+        if op is sre_parse.LITERAL:
+            char = chr(av)
+            return lambda groups: char
+
+        if op is sre_parse.NOT_LITERAL:
+            chars = _PRINTABLE.replace(chr(av), '')
+            return lambda groups: rnd.choice(chars)
+
+        if op is sre_parse.ANY:
+            return lambda groups: rnd.choice(_PRINTABLE)
+
+        if op is sre_parse.AT:
+            return lambda groups: ''
+
+        if op is sre_parse.IN:
+            chars = self.class_chars(av)
+            return lambda groups: rnd.choice(chars)
+
+        if op is sre_parse.BRANCH:
+            branches = [self.compile_sequence(items) for items in av[1]]
+            return lambda groups: rnd.choice(branches)(groups)
+
+        if op is sre_parse.SUBPATTERN:
+            group = av[0]
+            sequence = self.compile_sequence(av[-1])
+
+            def generate_group(groups):
+                text = sequence(groups)
+
+                if group is not None:
+                    groups[group] = text
+
+                return text
+
+            return generate_group
+
+        if op is sre_parse.MAX_REPEAT or op is sre_parse.MIN_REPEAT:
+            min_repeat, max_repeat, items = av
+            sequence = self.compile_sequence(items)
+
+            if max_repeat is sre_parse.MAXREPEAT:
+                max_repeat = min_repeat + self.max_repeat
+
+            return lambda groups: ''.join([
+                sequence(groups) for _ in range(rnd.randint(min_repeat, max_repeat))
+            ])
+
+        if op is sre_parse.GROUPREF:
+            return lambda groups: groups.get(av, '')
+
+        raise NotImplementedError('regex operation not supported: {}'.format(op))
+
+    def class_chars(self, items) -> str:
+        negate = False
+        chars = []
+
+        for op, av in items:
+            if op is sre_parse.NEGATE:
+                negate = True
+            elif op is sre_parse.LITERAL:
+                chars.append(chr(av))
+            elif op is sre_parse.RANGE:
+                # big ranges are capped, the generated chars stay readable
+                chars.extend(chr(c) for c in range(av[0], min(av[1], av[0] + 255) + 1))
+            elif op is sre_parse.CATEGORY:
+                chars.extend(_CATEGORY_CHARS[av])
+            else:
+                raise NotImplementedError('regex class operation not supported: {}'.format(op))
+
+        if negate:
+            excluded = set(chars)
+            return ''.join(c for c in _PRINTABLE if c not in excluded)
+
+        return ''.join(chars)
+
+
+class PayloadGenerator:
+    """
+    Generates valid and invalid values for a schema.
+
+    The schema is compiled once to a tree of functions, so generating a value
+    doesn't inspect the schema again.
+    """
+
+    # field class -> name of the method that compiles it
+    compilers = {
+        IntField: 'compile_int',
+        FloatField: 'compile_float',
+        StrField: 'compile_str',
+        BoolField: 'compile_bool',
+        DictField: 'compile_dict',
+        ListField: 'compile_list',
+        EnumField: 'compile_enum',
+        RegexField: 'compile_regex',
+        OrField: 'compile_or',
+        UUIDField: 'compile_uuid',
+        DateTimeField: 'compile_datetime',
+        DateField: 'compile_date',
+        EmailField: 'compile_email',
+        IPField: 'compile_ip',
+        URIField: 'compile_uri',
+    }
+
+    def __init__(self, schema, seed=None, max_items: int = 5, max_length: int = 16):
+        self.schema = schema
+        self.random = random.Random(seed)
+        self.max_items = max_items
+        self.max_length = max_length
+
+        # (steps, code, make_invalid, prop), a step is a dict prop or None for a list item,
+        # prop is added to the error path (the DictField rules), the nodes inside OrField
+        # branches have no steps (and no targets)
+        self.targets = []
+
+        # steps -> function that generates a valid value for the node
+        self.valid_functions = {}
+
+        self.generate_valid = self.compile(schema, ())
+
+    def compile(self, field, steps: tuple):
+        for field_class in type(field).__mro__:
+            method_name = self.compilers.get(field_class)
+
+            if method_name is not None:
+                generate = getattr(self, method_name)(field, steps)
+
+                if field.required:
+                    self.add_target(steps, 'REQUIRED_VALUE', lambda: None)
+
+                if steps is not None:
+                    self.valid_functions[steps] = generate
+
+                return generate
+
+        raise NotImplementedError('no generator for {}'.format(type(field).__name__))
+
+    def add_target(self, steps: tuple, code: str, make_invalid, prop: str = None):
+        if steps is not None:
+            self.targets.append((steps, code, make_invalid, prop))
+
+    @staticmethod
+    def validation_error(field, value):
+        try:
+            SchemaValidator(field, value).validate()
+        except SchemaValidationError as e:
+            return e
+
+        return None
+
+    @staticmethod
+    def child_steps(steps: tuple, step) -> tuple:
+        if steps is None:
+            return None
+
+        return steps + (step,)
+
+    def number_range(self, field, default_span):
+        low = field.min
+        high = field.max
+
+        if low is None:
+            low = high - default_span if high is not None else 0
+
+        if high is None:
+            high = low + default_span
+
+        return low, high
+
+    def compile_int(self, field: IntField, steps: tuple):
+        rnd = self.random
+        low, high = self.number_range(field, 1000)
+
+        self.add_target(steps, 'INT_TYPE', lambda: str(rnd.randint(low, high)))
+
+        if field.min is not None:
+            self.add_target(steps, 'INT_MIN', lambda: field.min - rnd.randint(1, 1000))
+
+        if field.max is not None:
+            self.add_target(steps, 'INT_MAX', lambda: field.max + rnd.randint(1, 1000))
+
+        return lambda: rnd.randint(low, high)
+
+    def compile_float(self, field: FloatField, steps: tuple):
+        rnd = self.random
+        low, high = self.number_range(field, 1000.0)
+        low, high = float(low), float(high)
+
+        self.add_target(steps, 'FLOAT_TYPE', lambda: rnd.randint(int(low), int(high)))
+
+        if field.min is not None:
+            self.add_target(steps, 'FLOAT_MIN', lambda: field.min - rnd.uniform(1.0, 1000.0))
+
+        if field.max is not None:
+            self.add_target(steps, 'FLOAT_MAX', lambda: field.max + rnd.uniform(1.0, 1000.0))
+
+        return lambda: rnd.uniform(low, high)
+
+    def random_str(self, min_length: int, max_length: int) -> str:
+        length = self.random.randint(min_length, max_length)
+
+        return ''.join(self.random.choices(string.ascii_letters, k=length))
+
+    def compile_str(self, field: StrField, steps: tuple):
+        min_length = field.min_length or 0
+        max_length = field.max_length
+
+        if max_length is None:
+            max_length = min_length + self.max_length
+
+        self.add_target(steps, 'STR_TYPE', lambda: self.random.randint(0, 1000))
+
+        if min_length > 0:
+            self.add_target(steps, 'STR_MIN_LENGTH', lambda: self.random_str(0, min_length - 1))
+
+        if field.max_length is not None:
+            self.add_target(steps, 'STR_MAX_LENGTH', lambda: self.random_str(max_length + 1, max_length * 2 + 1))
+
+        return lambda: self.random_str(min_length, max_length)
+
+    def compile_bool(self, field: BoolField, steps: tuple):
+        rnd = self.random
+
+        self.add_target(steps, 'BOOL_TYPE', lambda: rnd.choice(['true', 'false', 0, 1]))
+
+        return lambda: rnd.random() < 0.5
+
+    def compile_enum(self, field: EnumField, steps: tuple):
+        rnd = self.random
+        accept = list(field.accept)
+
+        if not accept:
+            raise ValueError('EnumField without accepted values')
+
+        def make_invalid():
+            value = self.random_str(8, 12)
+
+            while value in accept:
+                value = self.random_str(8, 12)
+
+            return value
+
+        self.add_target(steps, 'ENUM_VALUE_NOT_ACCEPT', make_invalid)
+
+        return lambda: rnd.choice(accept)
+
+    def compile_regex(self, field: RegexField, steps: tuple):
+        sequence = _RegexCompiler(self.random, self.max_length).compile(field.regex)
+
+        for _ in range(100):
+            invalid = self.random_str(0, self.max_length)
+
+            if not re.match(field.regex, invalid):
+                self.add_target(steps, 'REGEX_NOT_MATCH', lambda: invalid)
+                break
+
+        return lambda: sequence({})
+
+    def add_format_targets(self, field: FormatField, steps: tuple):
+        self.add_target(steps, '{}_TYPE'.format(field.code), lambda: self.random.randint(0, 1000))
+        self.add_target(steps, '{}_FORMAT'.format(field.code), lambda: self.random_str(1, self.max_length))
+
+    def compile_uuid(self, field: UUIDField, steps: tuple):
+        self.add_format_targets(field, steps)
+
+        return lambda: str(uuid.UUID(int=self.random.getrandbits(128), version=4))
+
+    def random_datetime(self) -> datetime.datetime:
+        return datetime.datetime(2000, 1, 1) + datetime.timedelta(seconds=self.random.randint(0, 40 * 365 * 86400))
+
+    def compile_datetime(self, field: DateTimeField, steps: tuple):
+        self.add_format_targets(field, steps)
+
+        return lambda: self.random_datetime().isoformat() + 'Z'
+
+    def compile_date(self, field: DateField, steps: tuple):
+        self.add_format_targets(field, steps)
+
+        return lambda: self.random_datetime().date().isoformat()
+
+    def random_domain(self) -> str:
+        return '{}.{}'.format(self.random_str(1, 12), self.random.choice(['com', 'org', 'io', 'com.br']))
+
+    def compile_email(self, field: EmailField, steps: tuple):
+        self.add_format_targets(field, steps)
+
+        return lambda: '{}@{}'.format(self.random_str(1, 12), self.random_domain())
+
+    def random_ip(self, version: int) -> str:
+        if version == 4:
+            return str(ipaddress.IPv4Address(self.random.getrandbits(32)))
+
+        return str(ipaddress.IPv6Address(self.random.getrandbits(128)))
+
+    def compile_ip(self, field: IPField, steps: tuple):
+        self.add_format_targets(field, steps)
+
+        if field.version is not None:
+            other_version = 6 if field.version == 4 else 4
+
+            self.add_target(steps, 'IP_VERSION', lambda: self.random_ip(other_version))
+
+            return lambda: self.random_ip(field.version)
+
+        return lambda: self.random_ip(self.random.choice([4, 6]))
+
+    def compile_uri(self, field: URIField, steps: tuple):
+        rnd = self.random
+        schemes = field.schemes or ['https', 'http']
+
+        self.add_format_targets(field, steps)
+
+        if field.schemes is not None:
+            def make_invalid_scheme():
+                scheme = self.random_str(3, 8).lower()
+
+                while scheme in schemes:
+                    scheme = self.random_str(3, 8).lower()
+
+                return '{}://{}/'.format(scheme, self.random_domain())
+
+            self.add_target(steps, 'URI_SCHEME', make_invalid_scheme)
+
+        return lambda: '{}://{}/{}'.format(rnd.choice(schemes), self.random_domain(), self.random_str(0, 8))
+
+    def compile_dict(self, field: DictField, steps: tuple):
+        rnd = self.random
+        props = [
+            (key, self.compile(prop_field, self.child_steps(steps, key)), key in field.optional_props)
+            for key, prop_field in field.schema.items()
+        ]
+
+        def generate_props():
+            return {
+                key: generate_prop()
+                for key, generate_prop, optional in props
+                if not optional or rnd.random() < 0.5
+            }
+
+        generate = generate_props
+
+        if field.rules:
+            # the props are generated again until the rules pass
+            def generate():
+                for _ in range(_RULE_ATTEMPTS):
+                    value = generate_props()
+
+                    if self.validation_error(field, value) is None:
+                        return value
+
+                raise ValueError('no value passing the DictField rules found in {} attempts'.format(_RULE_ATTEMPTS))
+
+            for rule in field.rules:
+                self.add_rule_target(field, steps, rule, generate_props)
+
+        self.add_target(steps, 'DICT_TYPE', lambda: self.random_str(1, 8))
+
+        for key, _, optional in props:
+            if not optional:
+                self.add_target(steps, 'DICT_PROP_MISSING', self.make_missing_prop(generate, key))
+
+        if field.strict:
+            def make_not_allowed():
+                value = generate()
+                key = '_' + self.random_str(8, 12)
+
+                while key in field.schema or key in field.optional_props:
+                    key = '_' + self.random_str(8, 12)
+
+                value[key] = True
+
+                return value
+
+            self.add_target(steps, 'DICT_PROP_NOT_ALLOWED', make_not_allowed)
+
+        return generate
+
+    def add_rule_target(self, field: DictField, steps: tuple, rule, generate_props):
+        path = '$root' if rule.prop is None else '$root.' + rule.prop
+
+        def breaks_rule(value) -> bool:
+            error = self.validation_error(field, value)
+
+            return error is not None and error.code == rule.code and error.path == path
+
+        def make_invalid():
+            for _ in range(_RULE_ATTEMPTS):
+                value = generate_props()
+
+                if breaks_rule(value):
+                    return value
+
+            return copy.deepcopy(example)
+
+        # the rules that the generated props never break have no target
+        for _ in range(_RULE_ATTEMPTS):
+            example = generate_props()
+
+            if breaks_rule(example):
+                self.add_target(steps, rule.code, make_invalid, rule.prop)
+                return
+
+    @staticmethod
+    def make_missing_prop(generate, key):
+        def make_invalid():
+            value = generate()
+            value.pop(key, None)
+
+            return value
+
+        return make_invalid
+
+    def compile_list(self, field: ListField, steps: tuple):
+        rnd = self.random
+        generate_item = self.compile(field.item_schema, self.child_steps(steps, None))
+        unique = field.unique_items or field.unique_by is not None
+
+        min_items = field.min_items or 0
+        max_items = field.max_items
+
+        if max_items is None:
+            max_items = min_items + self.max_items
+
+        def generate_items(count):
+            if not unique:
+                return [generate_item() for _ in range(count)]
+
+            items = []
+            seen = {}
+            attempts = count * 10
+
+            while len(items) < count and attempts:
+                attempts -= 1
+                item = generate_item()
+
+                # the same keys of the validation
+                if field.first_index(seen, item, len(items)) == len(items):
+                    items.append(item)
+
+            return items
+
+        def generate():
+            return generate_items(rnd.randint(min_items, max_items))
+
+        self.add_target(steps, 'LIST_TYPE', lambda: self.random_str(1, 8))
+
+        if min_items > 0:
+            self.add_target(steps, 'LIST_MIN_ITEMS', lambda: generate_items(rnd.randint(0, min_items - 1)))
+
+        if field.max_items is not None:
+            def make_too_many():
+                items = generate_items(max_items + rnd.randint(1, 3))
+
+                # the unique items can run out (ex: an EnumField item), the length is checked first anyway
+                while len(items) <= max_items:
+                    items.append(generate_item())
+
+                return items
+
+            self.add_target(steps, 'LIST_MAX_ITEMS', make_too_many)
+
+        if unique and max_items >= 2:
+            def make_duplicate():
+                items = generate_items(rnd.randint(max(min_items, 2), max_items) - 1)
+                items.append(items[rnd.randrange(len(items))])
+
+                return items
+
+            self.add_target(steps, 'LIST_DUPLICATE_ITEM', make_duplicate)
+
+        return generate
+
+    def compile_or(self, field: OrField, steps: tuple):
+        rnd = self.random
+
+        # the branches are compiled without steps: an invalid value inside
+        # a single branch doesn't make the OrField fail
+        branches = [self.compile(sc, None) for sc in field.schemas]
+
+        if steps is not None:
+            for probe in _PROBE_VALUES:
+                try:
+                    SchemaValidator(field, probe).validate()
+                except SchemaValidationError as e:
+                    if e.code == 'OR_NO_MATCHING_SCHEMA':
+                        self.add_target(steps, 'OR_NO_MATCHING_SCHEMA', lambda: probe)
+                        break
+
+        return lambda: rnd.choice(branches)()
+
+    def valid(self):
+        return self.generate_valid()
+
+    def invalid(self):
+        """
+        Returns a (code, path, value) tuple, the value is invalid only at the path.
+        """
+        if not self.targets:
+            raise ValueError('the schema has no invalid value')
+
+        return self.mutate(*self.random.choice(self.targets))
+
+    def mutations(self):
+        """
+        Returns a (code, path, value) tuple for each error code that the schema can raise.
+        """
+        return [self.mutate(*target) for target in self.targets]
+
+    def mutate(self, steps: tuple, code: str, make_invalid, prop: str = None):
+        path = ['$root']
+        value = self.build_invalid((), steps, make_invalid, path)
+
+        if prop is not None:
+            path.append(prop)
+
+        return code, '.'.join(path), value
+
+    def build_invalid(self, parent_steps: tuple, steps: tuple, make_invalid, path: list):
+        if len(parent_steps) == len(steps):
+            return make_invalid()
+
+        step = steps[len(parent_steps)]
+        child_steps = steps[:len(parent_steps) + 1]
+        value = self.valid_functions[parent_steps]()
+
+        if step is None:
+            if not value:
+                value = [self.valid_functions[child_steps]()]
+
+            index = self.random.randrange(len(value))
+            path.append('${}'.format(index))
+
+            value[index] = self.build_invalid(child_steps, steps, make_invalid, path)
+        else:
+            path.append(step)
+            value[step] = self.build_invalid(child_steps, steps, make_invalid, path)
+
+        return value
+
+    def documents(self, count: int, invalid_ratio: float = 0.0):
+        """
+        Yields `count` (code, path, value) tuples, code and path are None for the valid values.
+        """
+        rnd = self.random
+
+        for _ in range(count):
+            if invalid_ratio and rnd.random() < invalid_ratio:
+                yield self.invalid()
+            else:
+                yield None, None, self.generate_valid()
+
+    def write_ndjson(self, file, count: int, invalid_ratio: float = 0.0, annotate: bool = False):
+        """
+        Writes `count` values to `file`, one JSON per line.
+
+        If `annotate` is True, each line is an object with the `code`, `path` and `value`.
+        """
+        dumps = json.JSONEncoder(default=str, separators=(',', ':')).encode
+
+        for code, path, value in self.documents(count, invalid_ratio):
+            if annotate:
+                value = {'code': code, 'path': path, 'value': value}
+
+            file.write(dumps(value))
+            file.write('\n')
@@ -0,0 +1,233 @@
+import io
+import json
+from unittest import TestCase
+
+from py_schema import SchemaValidator, SchemaValidationError, \
+    IntField, StrField, BoolField, FloatField, DictField, ListField, \
+    EnumField, RegexField, OrField, UUIDField, DateTimeField, DateField, EmailField, IPField, URIField, \
+    Compare, RequiredIf, MutuallyExclusive
+from py_schema.generator import PayloadGenerator
+
+
+class PayloadGeneratorTest(TestCase):
+    def test_valid_values_should_pass(self):
+        schema = ListField(
+            min_items=1,
+            max_items=5,
+            item_schema=DictField(
+                schema={
+                    'id': IntField(min=1, max=10 ** 9),
+                    'name': StrField(min_length=2, max_length=50),
+                    'money': FloatField(min=0.0, max=999.9),
+                    'alive': BoolField(),
+                    'gender': EnumField(accept=['M', 'F', 'O']),
+                    'code': RegexField(regex='^([0-9]{3})'),
+                    'doc': OrField(
+                        schemas=[
+                            RegexField(regex='[0-9]{3}\\.?[0-9]{3}\\.?[0-9]{3}\\-?[0-9]{2}\\Z'),  # cpf
+                            RegexField(regex='[0-9]{2}\\.?[0-9]{3}\\.?[0-9]{3}\\/?[0-9]{4}\\-?[0-9]{2}\\Z')  # cnpj
+                        ]
+                    ),
+                    'tags': ListField(
+                        item_schema=StrField(min_length=1),
+                        max_items=3,
+                        unique_items=True
+                    )
+                },
+                strict=True,
+                optional_props=['gender', 'code', 'doc']
+            ),
+            unique_by='id'
+        )
+        generator = PayloadGenerator(schema, seed=1)
+
+        for _ in range(200):
+            SchemaValidator(schema, generator.valid()).validate()
+
+    def test_mutations_should_raise_their_error(self):
+        schema = ListField(
+            min_items=1,
+            max_items=5,
+            item_schema=DictField(
+                schema={
+                    'id': IntField(min=1, max=10 ** 9),
+                    'name': StrField(min_length=2, max_length=50),
+                    'money': FloatField(min=0.0, max=999.9),
+                    'alive': BoolField(),
+                    'gender': EnumField(accept=['M', 'F', 'O']),
+                    'code': RegexField(regex='^([0-9]{3})'),
+                    'doc': OrField(
+                        schemas=[
+                            RegexField(regex='[0-9]{3}\\.?[0-9]{3}\\.?[0-9]{3}\\-?[0-9]{2}\\Z'),  # cpf
+                            RegexField(regex='[0-9]{2}\\.?[0-9]{3}\\.?[0-9]{3}\\/?[0-9]{4}\\-?[0-9]{2}\\Z')  # cnpj
+                        ]
+                    ),
+                    'tags': ListField(
+                        item_schema=StrField(min_length=1),
+                        max_items=3,
+                        unique_items=True
+                    )
+                },
+                strict=True,
+                optional_props=['gender', 'code', 'doc']
+            ),
+            unique_by='id'
+        )
+        generator = PayloadGenerator(schema, seed=2)
+
+        mutations = generator.mutations()
+        codes = {code for code, _, _ in mutations}
+
+        self.assertTrue({
+            'REQUIRED_VALUE', 'LIST_MIN_ITEMS', 'LIST_MAX_ITEMS', 'LIST_DUPLICATE_ITEM', 'DICT_PROP_MISSING',
+            'DICT_PROP_NOT_ALLOWED', 'INT_MIN', 'STR_MAX_LENGTH', 'FLOAT_TYPE', 'BOOL_TYPE',
+            'ENUM_VALUE_NOT_ACCEPT', 'REGEX_NOT_MATCH', 'OR_NO_MATCHING_SCHEMA'
+        } <= codes)
+
+        for code, path, value in mutations:
+            try:
+                SchemaValidator(schema, value).validate()
+                self.fail()
+            except SchemaValidationError as e:
+                self.assertEqual(e.code, code)
+                self.assertEqual(e.path, path)
+
+    def test_format_fields_should_generate_valid_and_invalid_values(self):
+        schema = DictField(
+            schema={
+                'id': UUIDField(),
+                'created_at': DateTimeField(require_timezone=True),
+                'birthday': DateField(),
+                'email': EmailField(),
+                'ip': IPField(version=4),
+                'site': URIField(schemes=['https'], require_host=True)
+            }
+        )
+        generator = PayloadGenerator(schema, seed=4)
+
+        for _ in range(100):
+            SchemaValidator(schema, generator.valid()).validate()
+
+        mutations = generator.mutations()
+
+        self.assertTrue({'UUID_FORMAT', 'DATETIME_TYPE', 'DATE_FORMAT', 'EMAIL_FORMAT', 'IP_VERSION', 'URI_SCHEME'} <= {
+            code for code, _, _ in mutations
+        })
+
+        for code, path, value in mutations:
+            with self.assertRaises(SchemaValidationError) as context:
+                SchemaValidator(schema, value).validate()
+
+            self.assertEqual(context.exception.code, code)
+            self.assertEqual(context.exception.path, path)
+
+    def test_max_items_mutation_should_exceed_unique_items(self):
+        schema = ListField(item_schema=EnumField(accept=['a', 'b', 'c']), max_items=3, unique_items=True)
+        generator = PayloadGenerator(schema, seed=5)
+
+        for _ in range(20):
+            for code, path, value in generator.mutations():
+                with self.assertRaises(SchemaValidationError) as context:
+                    SchemaValidator(schema, value).validate()
+
+                self.assertEqual(context.exception.code, code)
+
+    def test_unique_items_should_keep_numbers_of_other_types(self):
+        schema = ListField(
+            item_schema=OrField(schemas=[IntField(min=1, max=1), BoolField()]),
+            min_items=3,
+            max_items=3,
+            unique_items=True
+        )
+        generator = PayloadGenerator(schema, seed=6)
+
+        for _ in range(20):
+            self.assertEqual(sorted(map(repr, generator.valid())), ['1', 'False', 'True'])
+
+    def test_dict_rules_should_be_respected_and_broken(self):
+        schema = ListField(
+            item_schema=DictField(
+                schema={
+                    'start': IntField(min=0, max=100),
+                    'end': IntField(min=0, max=100),
+                    'country': EnumField(accept=['BR', 'US']),
+                    'state': StrField(min_length=2, max_length=2),
+                    'email': EmailField(),
+                    'phone': StrField(min_length=8, max_length=12)
+                },
+                optional_props=['state', 'email', 'phone'],
+                rules=[
+                    Compare('end', '>=', 'start'),
+                    RequiredIf('state', 'country', values=['US']),
+                    MutuallyExclusive(['email', 'phone'], required=True)
+                ]
+            )
+        )
+        generator = PayloadGenerator(schema, seed=7)
+
+        for _ in range(200):
+            SchemaValidator(schema, generator.valid()).validate()
+
+        mutations = generator.mutations()
+
+        self.assertTrue({'DICT_PROPS_COMPARE', 'DICT_PROP_REQUIRED_IF', 'DICT_PROPS_EXCLUSIVE'} <= {
+            code for code, _, _ in mutations
+        })
+
+        for code, path, value in mutations:
+            with self.assertRaises(SchemaValidationError) as context:
+                SchemaValidator(schema, value).validate()
+
+            self.assertEqual(context.exception.code, code)
+            self.assertEqual(context.exception.path, path)
+
+    def test_same_seed_should_generate_same_values(self):
+        schema = ListField(
+            min_items=1,
+            max_items=5,
+            item_schema=DictField(
+                schema={
+                    'id': IntField(min=1, max=10 ** 9),
+                    'name': StrField(min_length=2, max_length=50),
+                    'money': FloatField(min=0.0, max=999.9),
+                    'alive': BoolField(),
+                    'gender': EnumField(accept=['M', 'F', 'O']),
+                    'code': RegexField(regex='^([0-9]{3})'),
+                    'doc': OrField(
+                        schemas=[
+                            RegexField(regex='[0-9]{3}\\.?[0-9]{3}\\.?[0-9]{3}\\-?[0-9]{2}\\Z'),  # cpf
+                            RegexField(regex='[0-9]{2}\\.?[0-9]{3}\\.?[0-9]{3}\\/?[0-9]{4}\\-?[0-9]{2}\\Z')  # cnpj
+                        ]
+                    ),
+                    'tags': ListField(
+                        item_schema=StrField(min_length=1),
+                        max_items=3,
+                        unique_items=True
+                    )
+                },
+                strict=True,
+                optional_props=['gender', 'code', 'doc']
+            ),
+            unique_by='id'
+        )
+
+        first = PayloadGenerator(schema, seed=3)
+        second = PayloadGenerator(schema, seed=3)
+
+        self.assertEqual(
+            [first.valid() for _ in range(10)] + [first.invalid() for _ in range(10)],
+            [second.valid() for _ in range(10)] + [second.invalid() for _ in range(10)]
+        )
+
+    def test_ndjson_should_write_one_value_per_line(self):
+        schema = DictField(schema={'id': IntField(min=1), 'name': StrField(max_length=10)})
+
+        generator = PayloadGenerator(schema, seed=4)
+        file = io.StringIO()
+
+        generator.write_ndjson(file, 20, invalid_ratio=0.5, annotate=True)
+
+        lines = [json.loads(line) for line in file.getvalue().splitlines()]
+
+        self.assertEqual(len(lines), 20)
+        self.assertEqual(set(lines[0]), {'code', 'path', 'value'})
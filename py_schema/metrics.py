@@ -0,0 +1,281 @@
+import logging
+from collections import deque
+from itertools import islice
+
+logger = logging.getLogger('py_schema')
+
+
+class LatencyHistogram:
+    """
+    HDR-style histogram of int values (ex: nanoseconds).
+
+    The values are counted in log-linear buckets: each power of two is split in
+    2 ** (`precision_bits` - 1) buckets, so the recorded values are kept with a relative
+    error below 1 / 2 ** (`precision_bits` - 1) and a constant memory, whatever the range.
+    """
+
+    def __init__(self, precision_bits: int = 8):
+        self.precision_bits = precision_bits
+        self.half_bucket_count = 1 << (precision_bits - 1)
+        self.counts = {}
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+
+    def bucket_index(self, value: int) -> int:
+        exponent = value.bit_length() - self.precision_bits
+
+        if exponent <= 0:
+            return value
+
+        return exponent * self.half_bucket_count + (value >> exponent)
+
+    def bucket_range(self, index: int) -> tuple:
+        """
+        Returns the (lowest, highest) values counted in the bucket.
+        """
+        if index < 2 * self.half_bucket_count:
+            return index, index
+
+        exponent = index // self.half_bucket_count - 1
+        mantissa = index - exponent * self.half_bucket_count
+
+        return mantissa << exponent, ((mantissa + 1) << exponent) - 1
+
+    def record(self, value: int):
+        value = max(int(value), 0)
+        index = self.bucket_index(value)
+
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.total += value
+
+        if self.min is None or value < self.min:
+            self.min = value
+
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def percentile(self, percentile: float):
+        """
+        Returns the highest value of the bucket of the percentile (0 to 100), or None if empty.
+        """
+        if not self.count:
+            return None
+
+        rank = max(1, -(-self.count * percentile // 100))
+        seen = 0
+
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+
+            if seen >= rank:
+                return min(self.bucket_range(index)[1], self.max)
+
+        return self.max
+
+    def mean(self):
+        return self.total / self.count if self.count else None
+
+
+def estimate_size(value, samples: int = None) -> int:
+    """
+    Returns an estimate of the JSON size, in bytes, of the value.
+
+    With `samples`, only `samples` items of the bigger dicts and lists are measured
+    and the size of the others is extrapolated, so the cost doesn't grow with the payload.
+    """
+    value_type = type(value)
+
+    if value_type is str:
+        return len(value) + 2
+
+    if value_type is dict:
+        count = len(value)
+        items = value.items()
+
+        if samples is not None and count > samples:
+            items = islice(items, samples)
+
+        size = 0
+
+        for key, item in items:
+            size += estimate_size(key, samples) + estimate_size(item, samples) + 2
+
+        if samples is not None and count > samples:
+            size = size * count // samples
+
+        return size + 2
+
+    if value_type is list or value_type is tuple:
+        count = len(value)
+        items = value
+
+        if samples is not None and count > samples:
+            # evenly spaced items
+            items = [value[index * count // samples] for index in range(samples)]
+
+        size = 0
+
+        for item in items:
+            size += estimate_size(item, samples) + 1
+
+        if samples is not None and count > samples:
+            size = size * count // samples
+
+        return size + 2
+
+    if value is None or value_type is bool:
+        return 4
+
+    return 8
+
+
+def shape(value, depth: int = 2):
+    """
+    Returns a summary of the value types and sizes, up to `depth` levels of containers.
+    """
+    if isinstance(value, dict):
+        summary = {'type': 'dict', 'size': len(value)}
+
+        if depth > 0:
+            summary['props'] = {str(key): shape(item, depth - 1) for key, item in value.items()}
+
+        return summary
+
+    if isinstance(value, (list, tuple)):
+        summary = {'type': type(value).__name__, 'size': len(value)}
+
+        if depth > 0 and value:
+            summary['items'] = shape(value[0], depth - 1)
+
+        return summary
+
+    if isinstance(value, str):
+        return {'type': 'str', 'size': len(value)}
+
+    return {'type': type(value).__name__}
+
+
+def hot_paths(value, limit: int = 5) -> list:
+    """
+    Returns the (path, estimated size) of the `limit` biggest containers of the value.
+
+    The list positions are replaced by `$*`, so the items of a list are summed in a single path.
+    """
+    sizes = {}
+
+    def measure(node, path: str) -> int:
+        if isinstance(node, dict):
+            size = 2 + sum(
+                estimate_size(key) + measure(item, '{}.{}'.format(path, key)) + 2
+                for key, item in node.items()
+            )
+        elif isinstance(node, (list, tuple)):
+            item_path = '{}.$*'.format(path)
+            size = 2 + sum(measure(item, item_path) + 1 for item in node)
+        else:
+            return estimate_size(node)
+
+        sizes[path] = sizes.get(path, 0) + size
+
+        return size
+
+    measure(value, '$root')
+
+    sizes.pop('$root', None)
+
+    return sorted(sizes.items(), key=lambda item: item[1], reverse=True)[:limit]
+
+
+class LatencyTracker:
+    """
+    Records the validation latencies and payload sizes of each schema name.
+
+    The payload sizes are sampled (see `estimate_size`) with `size_samples` items per container,
+    the validations slower than `slow_threshold` seconds are logged (logger `py_schema`, level warning)
+    with the payload shape and hot paths, and the last `max_slow_records` are kept in `slow_validations`.
+    """
+
+    def __init__(self, slow_threshold: float = None, max_slow_records: int = 100, max_hot_paths: int = 5,
+                 precision_bits: int = 8, size_samples: int = 8):
+        self.slow_threshold = slow_threshold
+        self.size_samples = size_samples
+        self.max_hot_paths = max_hot_paths
+        self.precision_bits = precision_bits
+        self.latencies = {}
+        self.sizes = {}
+        self.slow_validations = deque(maxlen=max_slow_records)
+
+    def histograms(self, name: str) -> tuple:
+        if name not in self.latencies:
+            self.latencies[name] = LatencyHistogram(self.precision_bits)
+            self.sizes[name] = LatencyHistogram(self.precision_bits)
+
+        return self.latencies[name], self.sizes[name]
+
+    def record(self, name: str, value, duration: int, error=None):
+        """
+        Records a validation of `value` that took `duration` nanoseconds.
+        """
+        latencies, sizes = self.histograms(name)
+
+        latencies.record(duration)
+        sizes.record(estimate_size(value, self.size_samples))
+
+        if self.slow_threshold is not None and duration > self.slow_threshold * 1e9:
+            self.record_slow(name, value, duration, error)
+
+    def record_slow(self, name: str, value, duration: int, error):
+        # the slow validations are rare, their payload is measured exactly
+        size = estimate_size(value)
+        record = {
+            'schema': name,
+            'duration': duration / 1e9,
+            'size': size,
+            'code': error.code if error is not None else None,
+            'shape': shape(value),
+            'hot_paths': hot_paths(value, self.max_hot_paths)
+        }
+
+        self.slow_validations.append(record)
+
+        logger.warning(
+            'slow validation of schema %s: %.3fms, ~%d bytes, hot paths: %s',
+            name,
+            duration / 1e6,
+            size,
+            ', '.join(path for path, _ in record['hot_paths']) or '-',
+            extra={'slow_validation': record}
+        )
+
+    def snapshot(self) -> dict:
+        """
+        Returns {name: stats} with the count, the min, mean, max, p50, p99 and p999 latencies
+        (in seconds) and the p50, p99 and max payload sizes (in bytes).
+        """
+        stats = {}
+
+        for name, latencies in self.latencies.items():
+            sizes = self.sizes[name]
+
+            stats[name] = {
+                'count': latencies.count,
+                'min': latencies.min / 1e9,
+                'mean': latencies.mean() / 1e9,
+                'max': latencies.max / 1e9,
+                'p50': latencies.percentile(50) / 1e9,
+                'p99': latencies.percentile(99) / 1e9,
+                'p999': latencies.percentile(99.9) / 1e9,
+                'size_p50': sizes.percentile(50),
+                'size_p99': sizes.percentile(99),
+                'size_max': sizes.max
+            }
+
+        return stats
+
+    def reset(self):
+        self.latencies = {}
+        self.sizes = {}
+        self.slow_validations.clear()
@@ -0,0 +1,193 @@
+from unittest import TestCase
+
+from py_schema import SchemaValidator, SchemaValidationError, \
+    IntField, StrField, DictField, ListField, OrField
+from py_schema.metrics import LatencyHistogram, LatencyTracker, estimate_size, hot_paths
+
+
+def build_value(items: int):
+    return {
+        'name': 'order',
+        'code': 'A1',
+        'items': [{'id': index, 'tags': ['a', 'b']} for index in range(items)]
+    }
+
+
+class LatencyHistogramTest(TestCase):
+    def test_percentiles_should_have_bounded_relative_error(self):
+        histogram = LatencyHistogram(precision_bits=8)
+
+        for value in range(1, 100001):
+            histogram.record(value * 1000)
+
+        self.assertEqual(histogram.count, 100000)
+        self.assertEqual(histogram.min, 1000)
+        self.assertEqual(histogram.max, 100000000)
+
+        for percentile, expected in [(50, 50000000), (99, 99000000), (99.9, 99900000)]:
+            self.assertAlmostEqual(histogram.percentile(percentile) / expected, 1, delta=1 / 128)
+
+    def test_small_values_should_be_exact(self):
+        histogram = LatencyHistogram()
+
+        for value in [3, 3, 7, 200]:
+            histogram.record(value)
+
+        self.assertEqual(histogram.percentile(50), 3)
+        self.assertEqual(histogram.percentile(75), 7)
+        self.assertEqual(histogram.percentile(100), 200)
+
+    def test_empty_histogram_should_not_have_percentiles(self):
+        self.assertIsNone(LatencyHistogram().percentile(99))
+
+
+class LatencyTrackerTest(TestCase):
+    def tearDown(self):
+        SchemaValidator.tracker = None
+
+    def test_snapshot_should_export_each_schema_stats(self):
+        schema = DictField(
+            schema={
+                'name': StrField(),
+                'code': OrField(
+                    schemas=[
+                        IntField(),
+                        StrField()
+                    ]
+                ),
+                'items': ListField(
+                    item_schema=DictField(
+                        schema={
+                            'id': IntField(),
+                            'tags': ListField(item_schema=StrField())
+                        }
+                    )
+                )
+            }
+        )
+
+        tracker = LatencyTracker()
+        schema = schema
+
+        for _ in range(10):
+            SchemaValidator(schema, build_value(3), name='order', tracker=tracker).validate()
+
+        with self.assertRaises(SchemaValidationError):
+            SchemaValidator(schema, {}, name='order', tracker=tracker).validate()
+
+        SchemaValidator(IntField(), 1, tracker=tracker).validate()
+
+        stats = tracker.snapshot()
+
+        self.assertEqual(set(stats), {'order', 'IntField'})
+        self.assertEqual(stats['order']['count'], 11)
+        self.assertEqual(stats['IntField']['count'], 1)
+        self.assertTrue(0 < stats['order']['p50'] <= stats['order']['p99'] <= stats['order']['p999'])
+        self.assertEqual(stats['order']['size_max'], estimate_size(build_value(3)))
+
+    def test_slow_validation_should_be_logged_with_hot_paths(self):
+        schema = DictField(
+            schema={
+                'name': StrField(),
+                'code': OrField(
+                    schemas=[
+                        IntField(),
+                        StrField()
+                    ]
+                ),
+                'items': ListField(
+                    item_schema=DictField(
+                        schema={
+                            'id': IntField(),
+                            'tags': ListField(item_schema=StrField())
+                        }
+                    )
+                )
+            }
+        )
+
+        tracker = LatencyTracker(slow_threshold=0)
+
+        with self.assertLogs('py_schema', level='WARNING') as logs:
+            SchemaValidator(schema, build_value(100), name='order', tracker=tracker).validate()
+
+        self.assertIn('slow validation of schema order', logs.output[0])
+
+        record, = tracker.slow_validations
+
+        self.assertEqual(record['schema'], 'order')
+        self.assertIsNone(record['code'])
+        self.assertEqual(record['shape']['props']['items'], {'type': 'list', 'size': 100, 'items': {'type': 'dict', 'size': 2}})
+        self.assertEqual([path for path, _ in record['hot_paths'][:3]], ['$root.items', '$root.items.$*', '$root.items.$*.tags'])
+
+    def test_fast_validation_should_not_be_logged(self):
+        schema = DictField(
+            schema={
+                'name': StrField(),
+                'code': OrField(
+                    schemas=[
+                        IntField(),
+                        StrField()
+                    ]
+                ),
+                'items': ListField(
+                    item_schema=DictField(
+                        schema={
+                            'id': IntField(),
+                            'tags': ListField(item_schema=StrField())
+                        }
+                    )
+                )
+            }
+        )
+
+        tracker = LatencyTracker(slow_threshold=10)
+
+        SchemaValidator(schema, build_value(1), tracker=tracker).validate()
+
+        self.assertEqual(len(tracker.slow_validations), 0)
+
+    def test_global_tracker_should_only_record_root_validations(self):
+        schema = DictField(
+            schema={
+                'name': StrField(),
+                'code': OrField(
+                    schemas=[
+                        IntField(),
+                        StrField()
+                    ]
+                ),
+                'items': ListField(
+                    item_schema=DictField(
+                        schema={
+                            'id': IntField(),
+                            'tags': ListField(item_schema=StrField())
+                        }
+                    )
+                )
+            }
+        )
+
+        tracker = LatencyTracker()
+        SchemaValidator.tracker = tracker
+
+        SchemaValidator(schema, build_value(5), name='order').validate()
+
+        self.assertEqual(tracker.snapshot()['order']['count'], 1)
+        self.assertEqual(list(tracker.snapshot()), ['order'])
+
+    def test_sampled_size_should_extrapolate_big_containers(self):
+        value = build_value(1000)
+
+        self.assertEqual(estimate_size(value, samples=8), estimate_size(value))
+        self.assertEqual(estimate_size({'a': 'b'}, samples=8), estimate_size({'a': 'b'}))
+        self.assertAlmostEqual(estimate_size(['a', 'bcd'] * 500, samples=8) / estimate_size(['a', 'bcd'] * 500), 1, delta=0.05)
+
+    def test_hot_paths_should_sum_list_items(self):
+        value = {'a': [[1, 2], [3]], 'b': {'c': 'text'}}
+
+        self.assertEqual(dict(hot_paths(value)), {
+            '$root.a': 2 + (2 + 2 * 9 + 1) + (2 + 9 + 1),
+            '$root.a.$*': (2 + 2 * 9) + (2 + 9),
+            '$root.b': 2 + 3 + 6 + 2
+        })
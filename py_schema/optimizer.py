@@ -0,0 +1,200 @@
+import re
+
+try:
+    import re._parser as sre_parse
+except ImportError:  # python < 3.11
+    import sre_parse
+
+from .py_schema import BaseField, IntField, FloatField, StrField, BoolField, DictField, ListField, \
+    EnumField, RegexField, OrField, RegexUnionField
+
+# attributes that are state of the validations, not part of the schema definition
+_STATE_ATTRIBUTES = frozenset([
+    'value', 'ctx', 'constructor', 'adaptive_runs', 'prop_order', 'prop_failures', 'steps', 'step_order', 'step_rank',
+    'branch_order', 'branch_matches', 'pattern'
+])
+
+
+def signature(field):
+    """
+    Returns a hashable value, equal for fields with the same definition.
+    """
+    if isinstance(field, dict):
+        return dict, tuple((key, signature(value)) for key, value in field.items())
+
+    if isinstance(field, (list, tuple)):
+        return list, tuple(signature(item) for item in field)
+
+    if isinstance(field, re.Pattern):
+        return re.Pattern, field.pattern, field.flags
+
+    if not isinstance(field, BaseField):
+        try:
+            hash(field)
+            return field
+        except TypeError:
+            return repr(field)
+
+    return type(field), tuple(
+        (key, signature(value))
+        for key, value in sorted(vars(field).items())
+        if key not in _STATE_ATTRIBUTES
+    )
+
+
+def _contains_range(outer_min, outer_max, inner_min, inner_max) -> bool:
+    if outer_min is not None and (inner_min is None or inner_min < outer_min):
+        return False
+
+    if outer_max is not None and (inner_max is None or inner_max > outer_max):
+        return False
+
+    return True
+
+
+def subsumes(field, other) -> bool:
+    """
+    Returns True if every value valid for `other` is also valid for `field`
+    (only checked for the scalar fields).
+    """
+    if type(field) is not type(other) or field.required != other.required:
+        return False
+
+    if type(field) in (IntField, FloatField):
+        return _contains_range(field.min, field.max, other.min, other.max)
+
+    if type(field) is StrField:
+        return _contains_range(field.min_length, field.max_length, other.min_length, other.max_length)
+
+    if type(field) is BoolField:
+        return True
+
+    if type(field) is EnumField:
+        return all(accept_value in field.accept for accept_value in other.accept)
+
+    return False
+
+
+def _has_group_references(items) -> bool:
+    for op, av in items:
+        if op is sre_parse.GROUPREF or op is sre_parse.GROUPREF_EXISTS:
+            return True
+
+        if op is sre_parse.SUBPATTERN and _has_group_references(av[-1]):
+            return True
+
+        if op is sre_parse.BRANCH and any(_has_group_references(branch) for branch in av[1]):
+            return True
+
+        if (op is sre_parse.MAX_REPEAT or op is sre_parse.MIN_REPEAT) and _has_group_references(av[2]):
+            return True
+
+        if (op is sre_parse.ASSERT or op is sre_parse.ASSERT_NOT) and _has_group_references(av[1]):
+            return True
+
+    return False
+
+
+def mergeable(field) -> bool:
+    """
+    Returns True if the regex of the RegexField can be merged in an alternation.
+    """
+    if type(field) is not RegexField or not field.required:
+        return False
+
+    regex = field.regex
+
+    if not isinstance(regex, str):
+        # compiled patterns are only merged without flags
+        if regex.flags & ~re.UNICODE:
+            return False
+
+        regex = regex.pattern
+
+    try:
+        compiled = re.compile(regex)
+        parsed = sre_parse.parse(regex)
+    except (re.error, TypeError):
+        return False
+
+    # the named groups would be duplicated and the references would point to other groups
+    if compiled.groupindex or compiled.flags & ~re.UNICODE:
+        return False
+
+    return not _has_group_references(parsed)
+
+
+def optimize_or(field: OrField):
+    schemas = []
+
+    for branch in field.schemas:
+        branch = optimize(branch)
+
+        # the nested branches are only moved up if they can't receive a value
+        # that the nested OrField would reject as REQUIRED_VALUE
+        if isinstance(branch, OrField) and (field.required or not branch.required):
+            schemas.extend(branch.schemas)
+        else:
+            schemas.append(branch)
+
+    kept = []
+    signatures = set()
+
+    # the first matching branch decides the returned value, so the branches that
+    # build values can't be passed by a broader branch moved before them
+    builds = any(branch.builds for branch in schemas)
+
+    for branch in schemas:
+        branch_signature = signature(branch)
+
+        if branch_signature in signatures or any(subsumes(other, branch) for other in kept):
+            continue
+
+        signatures.add(branch_signature)
+
+        # the kept branches subsumed by the new one are replaced by it
+        subsumed = [index for index, other in enumerate(kept) if subsumes(branch, other)]
+
+        if subsumed and not builds:
+            kept[subsumed[0]] = branch
+            kept = [other for index, other in enumerate(kept) if index not in subsumed[1:]]
+        else:
+            kept.append(branch)
+
+    if len(kept) > 1 and all(mergeable(branch) for branch in kept):
+        try:
+            return RegexUnionField(
+                schemas=kept,
+                max_errors=vars(field).get('max_errors'),
+                max_error_depth=vars(field).get('max_error_depth'),
+                required=field.required
+            )
+        except re.error:
+            pass
+
+    field.schemas = kept
+    field.builds = any(branch.builds for branch in kept)
+    field.branch_order = list(range(len(kept)))
+    field.branch_matches = [0] * len(kept)
+
+    return field
+
+
+def optimize(schema):
+    """
+    Normalizes a schema tree, to be used as `schema = optimize(schema)`:
+
+    - the OrFields nested in OrFields are flattened
+    - the duplicated OrField branches and the scalar branches subsumed by another one are removed
+    - the OrFields of RegexFields are replaced by a RegexUnionField, a single regex
+
+    The containers are changed in place, the OrFields can be replaced by new fields.
+    """
+    if isinstance(schema, DictField):
+        schema.schema = {key: optimize(field) for key, field in schema.schema.items()}
+    elif isinstance(schema, ListField):
+        schema.item_schema = optimize(schema.item_schema)
+    elif type(schema) is OrField:
+        return optimize_or(schema)
+
+    return schema
@@ -0,0 +1,129 @@
+import re
+from datetime import datetime
+from unittest import TestCase
+
+from py_schema import SchemaValidator, SchemaValidationError, \
+    IntField, StrField, BoolField, DictField, ListField, \
+    EnumField, RegexField, OrField, RegexUnionField, DateTimeField
+from py_schema.optimizer import optimize, signature
+
+CPF = '[0-9]{3}\\.?[0-9]{3}\\.?[0-9]{3}\\-?[0-9]{2}\\Z'
+CNPJ = '[0-9]{2}\\.?[0-9]{3}\\.?[0-9]{3}\\/?[0-9]{4}\\-?[0-9]{2}\\Z'
+
+
+class OptimizerTest(TestCase):
+    def test_nested_or_fields_should_be_flattened(self):
+        schema = optimize(OrField(
+            schemas=[
+                StrField(),
+                OrField(
+                    schemas=[
+                        IntField(),
+                        OrField(schemas=[BoolField()])
+                    ]
+                )
+            ]
+        ))
+
+        self.assertEqual(
+            [type(branch) for branch in schema.schemas],
+            [StrField, IntField, BoolField]
+        )
+
+        SchemaValidator(schema, True).validate()
+
+    def test_duplicated_and_subsumed_branches_should_be_removed(self):
+        schema = optimize(OrField(
+            schemas=[
+                IntField(min=0, max=10),
+                StrField(max_length=5),
+                IntField(min=0),
+                StrField(max_length=5),
+                EnumField(accept=['a']),
+                EnumField(accept=['a', 'b'])
+            ]
+        ))
+
+        self.assertEqual(
+            [signature(branch) for branch in schema.schemas],
+            [signature(IntField(min=0)), signature(StrField(max_length=5)), signature(EnumField(accept=['a', 'b']))]
+        )
+
+    def test_building_branches_should_keep_their_order(self):
+        schema = optimize(OrField(
+            schemas=[
+                StrField(max_length=5),
+                DateTimeField(coerce=True),
+                StrField(),
+                StrField(max_length=3)
+            ]
+        ))
+
+        self.assertEqual(
+            [signature(branch) for branch in schema.schemas],
+            [signature(StrField(max_length=5)), signature(DateTimeField(coerce=True)), signature(StrField())]
+        )
+        self.assertIsInstance(SchemaValidator(schema, '2020-01-01T00:00Z').validate(), datetime)
+
+    def test_regex_branches_should_be_merged(self):
+        schema = optimize(DictField(
+            schema={
+                'docs': ListField(
+                    item_schema=OrField(
+                        schemas=[
+                            RegexField(regex=CPF),
+                            OrField(schemas=[RegexField(regex=re.compile(CNPJ))])
+                        ]
+                    )
+                )
+            }
+        ))
+
+        union = schema.schema['docs'].item_schema
+
+        self.assertIsInstance(union, RegexUnionField)
+        self.assertEqual(union.match_branch('759.425.730-85'), 0)
+        self.assertEqual(union.match_branch('31.035.254/0001-79'), 1)
+        self.assertIsNone(union.match_branch('abc'))
+
+        SchemaValidator(schema, {'docs': ['759.425.730-85', '31.035.254/0001-79']}).validate()
+
+        try:
+            SchemaValidator(schema, {'docs': ['759.425.730-85', 'abc']}).validate()
+            self.fail()
+        except SchemaValidationError as e:
+            self.assertEqual(
+                e.path, '$root.docs.$1'
+            )
+            self.assertEqual(
+                e.code, 'OR_NO_MATCHING_SCHEMA'
+            )
+            self.assertEqual(
+                [error.code for error in e.extra['errors']],
+                ['REGEX_NOT_MATCH', 'REGEX_NOT_MATCH']
+            )
+
+    def test_regex_with_group_references_should_not_be_merged(self):
+        schema = optimize(OrField(
+            schemas=[
+                RegexField(regex='(a)\\1'),
+                RegexField(regex='b')
+            ]
+        ))
+
+        self.assertIs(type(schema), OrField)
+
+    def test_merged_regex_should_raise_same_errors(self):
+        schemas = [RegexField(regex=CPF), RegexField(regex=CNPJ)]
+
+        for value in [None, '1', '759.425.730-85']:
+            errors = []
+
+            for schema in [OrField(schemas=schemas, required=False), optimize(OrField(schemas=schemas, required=False))]:
+                try:
+                    SchemaValidator(schema, value).validate()
+                    errors.append(None)
+                except SchemaValidationError as e:
+                    errors.append((e.code, [error.code for error in e.extra['errors']]))
+
+            self.assertEqual(errors[0], errors[1])
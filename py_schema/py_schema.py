@@ -1,20 +1,168 @@
+import ipaddress
 import re
+import time
+import uuid
+import weakref
+import datetime
+import inspect
+from urllib.parse import urlsplit
 
 
 class SchemaValidationError(Exception):
-    def __init__(self, code: str, path: str, node, extra=None):
+    __slots__ = ('code', 'extra', '_path', '_node', '_message')
+
+    def __init__(self, code: str, path, node, extra=None):
+        super(SchemaValidationError, self).__init__(code)
         self.code = code
-        self.path = path
-        self.node = node
         self.extra = extra
+        self._message = None
+
+        if isinstance(path, str):
+            self._path = tuple(path.split('.'))
+        else:
+            self._path = tuple(path)
+
+        # the error only keeps a weak reference to the schema node, so
+        # errors kept around (logs, OrField trees) never pin a schema.
+        if node is None:
+            self._node = None
+        else:
+            try:
+                self._node = weakref.ref(node)
+            except TypeError:
+                self._node = lambda: node
+
+    @property
+    def path(self) -> str:
+        return '.'.join(self._path)
+
+    @property
+    def path_items(self) -> tuple:
+        return self._path
+
+    @property
+    def node(self):
+        if self._node is None:
+            return None
+
+        return self._node()
+
+    @property
+    def message(self) -> str:
+        if self._message is None:
+            self._message = '{} at {}'.format(self.code, self.path)
+
+        return self._message
+
+    def __str__(self):
+        return self.message
+
+    def __reduce__(self):
+        return self.__class__, (self.code, self._path, None, self.extra)
+
+
+class ErrorGroup:
+    __slots__ = ('path', 'code', 'count', 'examples', 'sample')
+
+    def __init__(self, path: str, code: str, sample):
+        self.path = path
+        self.code = code
+        self.count = 0
+        self.examples = []
+        self.sample = sample
+
+
+class ErrorReport:
+    """
+    Errors grouped by schema path (with `$*` for the list indexes) and code,
+    each group keeps the count, the list indexes of the first examples and
+    the value of the first error.
+    """
+
+    def __init__(self, max_examples: int = 5):
+        self.max_examples = max_examples
+        self.groups = {}
+        self.count = 0
+
+    def add(self, error: SchemaValidationError, list_indexes: list, sample=None, example: tuple = None):
+        """
+        `list_indexes` is a list of (path position, item index) of the lists that contain the error.
+        """
+        path_items = list(error.path_items)
+
+        for position, _ in list_indexes:
+            if position < len(path_items):
+                path_items[position] = '$*'
+
+        key = ('.'.join(path_items), error.code)
+        group = self.groups.get(key)
+
+        if group is None:
+            group = self.groups[key] = ErrorGroup(key[0], error.code, sample)
+
+        group.count += 1
+        self.count += 1
+
+        if len(group.examples) < self.max_examples:
+            if example is None:
+                example = tuple(index for _, index in list_indexes)
+
+            group.examples.append(example)
+
+    def as_list(self) -> list:
+        return [
+            {
+                'path': group.path,
+                'code': group.code,
+                'count': group.count,
+                'examples': group.examples,
+                'sample': group.sample
+            }
+            for group in self.groups.values()
+        ]
 
 
 class SchemaValidator:
-    def __init__(self, schema, value):
+    # py_schema.metrics.LatencyTracker used by all the validators without a tracker
+    tracker = None
+
+    def __init__(self, schema, value, memoize: bool = False, aggregate: bool = False, max_examples: int = 5,
+                 name: str = None, tracker=None):
         self.schema = schema
         self.value = value
+        self.name = name
         self.path = ['$root']
         self.is_valid = None
+        self.or_depth = 0
+        self.max_or_depth = None
+        self.memoize = memoize
+        self.aggregate = aggregate
+        self.max_examples = max_examples
+
+        # (id(node), id(value)) -> (value, fingerprint, result, child entries), only during a validation
+        self.memo = None
+        # the child entries of the memoized node being validated
+        self.memo_children = None
+
+        # in aggregate mode, the report and the (path position, item index) of the lists being validated
+        self.report = None
+        self.list_indexes = []
+
+        if tracker is not None:
+            self.tracker = tracker
+
+    def branch(self, schema, value, max_or_depth: int = None):
+        validator = SchemaValidator(
+            schema=schema,
+            value=value
+        )
+        validator.or_depth = self.or_depth + 1
+        validator.max_or_depth = max_or_depth
+        validator.memo = self.memo
+        validator.memo_children = self.memo_children
+        validator.tracker = None
+
+        return validator
 
     def add_to_path(self, key: str):
         self.path.append(key)
@@ -27,19 +175,179 @@ class SchemaValidator:
 
         raise SchemaValidationError(
             code=code,
-            path='.'.join(self.path),
+            path=tuple(self.path),
             node=node,
             extra=extra
         )
 
+    def record_error(self, error: SchemaValidationError):
+        node = error.node
+
+        self.report.add(
+            error,
+            self.list_indexes,
+            sample=node.value if node is not None else None
+        )
+
     def validate(self):
-        self.schema.value = self.value
-        self.schema.ctx = self
-        self.schema.validate()
+        tracker = self.tracker
+
+        if tracker is None:
+            return self.run()
+
+        start = time.perf_counter_ns()
+        error = None
+
+        try:
+            return self.run()
+        except SchemaValidationError as err:
+            error = err
+            raise
+        finally:
+            tracker.record(
+                self.name if self.name is not None else type(self.schema).__name__,
+                self.value,
+                time.perf_counter_ns() - start,
+                error
+            )
+
+    def run(self):
+        if self.memoize:
+            self.memo = {}
+
+        if self.aggregate:
+            self.report = ErrorReport(self.max_examples)
+            self.list_indexes = []
+
+        try:
+            self.schema.value = self.value
+            self.schema.ctx = self
+            value = self.schema.validate()
+        except SchemaValidationError as err:
+            if not self.aggregate:
+                raise
+
+            self.record_error(err)
+        finally:
+            if self.memoize:
+                self.memo = None
+                self.memo_children = None
+
+        if self.report is not None and self.report.count:
+            self.raise_error(
+                code='AGGREGATED_ERRORS',
+                node=self.schema,
+                extra={'report': self.report}
+            )
+
         self.is_valid = True
 
+        return value
+
+
+def _missing_defaults(target, optional_props: [str]) -> dict:
+    """
+    Returns {prop: None} for the optional props that `target` can't build without,
+    the props with a default in the target are left to it.
+    """
+    if target.__init__ is not object.__init__ or target.__new__ is not object.__new__:
+        try:
+            parameters = inspect.signature(target).parameters
+        except (TypeError, ValueError):
+            return dict.fromkeys(optional_props)
+
+        return {
+            prop: None
+            for prop in optional_props
+            if prop in parameters and parameters[prop].default is inspect.Parameter.empty
+        }
+
+    # the __slots__ are class attributes too, but without a value
+    return {
+        prop: None
+        for prop in optional_props
+        if inspect.ismemberdescriptor(getattr(target, prop, None)) or not hasattr(target, prop)
+    }
+
+
+def _build_constructor(target, optional_props: [str] = ()):
+    """
+    Resolves once how instances of `target` are created from a dict of props,
+    so the validation loop only has to call the returned function.
+
+    The missing `optional_props` are passed as None, unless the target has a default for them.
+    """
+    if target is None:
+        return None
+
+    defaults = _missing_defaults(target, optional_props)
+
+    if target.__init__ is not object.__init__ or target.__new__ is not object.__new__:
+        # dataclasses, namedtuples and classes with a custom __init__
+        if defaults:
+            return lambda values: target(**dict(defaults, **values))
+
+        return lambda values: target(**values)
+
+    # plain or __slots__ classes without an __init__
+    new = target.__new__
+
+    def construct(values):
+        instance = new(target)
+
+        for key, prop_value in defaults.items():
+            setattr(instance, key, prop_value)
+
+        for key, prop_value in values.items():
+            setattr(instance, key, prop_value)
+
+        return instance
+
+    return construct
+
+
+def _fingerprint(value):
+    """
+    Shallow identity of a dict or a list, used to detect that a memoized value
+    was changed during the validation.
+    """
+    if type(value) is dict:
+        return tuple(map(id, value)), tuple(map(id, value.values()))
+
+    return tuple(map(id, value))
+
+
+def _unchanged(entry) -> bool:
+    """
+    True if the value of a memo entry, and the nested values memoized while validating it,
+    still have the fingerprints of their validation.
+    """
+    checked = set()
+    entries = [entry]
+
+    while entries:
+        entry = entries.pop()
+
+        if id(entry) in checked:
+            continue
+
+        checked.add(id(entry))
+
+        if _fingerprint(entry[0]) != entry[1]:
+            return False
+
+        entries.extend(entry[3])
+
+    return True
+
 
 class BaseField:
+    # True if the validation returns a new value (ex: DictField with a target)
+    builds: bool = False
+
+    # True if the validation of dict and list values can be memoized
+    memoizable: bool = False
+
     def __init__(self, required: bool = True):
         self.required = required
         self.value: any = None
@@ -53,9 +361,68 @@ class BaseField:
         raise NotImplementedError()
 
     def validate(self):
+        if self.memoizable and self.ctx.memo is not None:
+            return self.validate_memoized()
+
         self.validate_required()
         self.validator()
 
+        return self.value
+
+    def validate_memoized(self):
+        value = self.value
+
+        if type(value) is not dict and type(value) is not list:
+            self.validate_required()
+            self.validator()
+
+            return self.value
+
+        ctx = self.ctx
+        memo = ctx.memo
+        key = (id(self), id(value))
+        parent_children = ctx.memo_children
+
+        entry = memo.get(key)
+
+        if entry is not None and _unchanged(entry):
+            if parent_children is not None:
+                parent_children.append(entry)
+
+            return entry[2]
+
+        fingerprint = _fingerprint(value)
+        children = ctx.memo_children = []
+        report = ctx.report
+        error_count = report.count if report is not None else 0
+
+        try:
+            self.validate_required()
+            self.validator()
+        finally:
+            ctx.memo_children = parent_children
+
+        if report is not None and report.count != error_count:
+            # in aggregate mode, the errors recorded below must be recorded again for each occurrence
+            return self.value
+
+        # the entry keeps the value alive, so its id can't be reused in this validation
+        entry = memo[key] = (value, fingerprint, self.value, children)
+
+        if parent_children is not None:
+            parent_children.append(entry)
+
+        return self.value
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+
+        # the state of the last validation is never pickled
+        state['value'] = None
+        state['ctx'] = None
+
+        return state
+
     def raise_error(self, code: str, extra=None):
         self.ctx.raise_error(
             code=code,
@@ -141,81 +508,602 @@ class BoolField(BaseField):
             )
 
 
+def _is_container(field) -> bool:
+    return isinstance(field, (DictField, ListField, OrField))
+
+
+def _is_present(values: dict, prop) -> bool:
+    return values.get(prop) is not None
+
+
+class DictRule:
+    """
+    Base of the DictField cross-field rules. A rule is checked right after all its `props`
+    passed their own checks, with the validated values of the dict.
+    """
+
+    code: str = 'DICT_RULE'
+
+    # the prop added to the error path, None for the dict path
+    prop = None
+
+    def __init__(self, props: [str]):
+        self.props = props
+
+    def check(self, values: dict) -> bool:
+        raise NotImplementedError()
+
+    def extra(self, values: dict) -> dict:
+        return {'props': list(self.props)}
+
+
+class Compare(DictRule):
+    """
+    `prop` `op` `other`, ex: `Compare('end', '>=', 'start')`. Skipped if one of the props is missing.
+    """
+
+    code = 'DICT_PROPS_COMPARE'
+
+    operators = {
+        '<': lambda a, b: a < b,
+        '<=': lambda a, b: a <= b,
+        '>': lambda a, b: a > b,
+        '>=': lambda a, b: a >= b,
+        '==': lambda a, b: a == b,
+        '!=': lambda a, b: a != b,
+    }
+
+    def __init__(self, prop: str, op: str, other: str):
+        if op not in self.operators:
+            raise ValueError('unknown operator "{}"'.format(op))
+
+        super(Compare, self).__init__([prop, other])
+        self.prop = prop
+        self.op = op
+        self.other = other
+
+    def check(self, values: dict) -> bool:
+        if not _is_present(values, self.prop) or not _is_present(values, self.other):
+            return True
+
+        try:
+            return self.operators[self.op](values[self.prop], values[self.other])
+        except TypeError:
+            return False
+
+    def extra(self, values: dict) -> dict:
+        return {'prop': self.prop, 'op': self.op, 'other': self.other}
+
+
+class RequiredIf(DictRule):
+    """
+    `prop` is required when `other` is present (and, with `values`, when its value is one of them).
+    """
+
+    code = 'DICT_PROP_REQUIRED_IF'
+
+    def __init__(self, prop: str, other: str, values: [any] = None):
+        super(RequiredIf, self).__init__([prop, other])
+        self.required_prop = prop
+        self.other = other
+        self.values = values
+
+    def check(self, values: dict) -> bool:
+        if _is_present(values, self.required_prop) or not _is_present(values, self.other):
+            return True
+
+        return self.values is not None and values[self.other] not in self.values
+
+    def extra(self, values: dict) -> dict:
+        return {'prop': self.required_prop, 'other': self.other}
+
+
+class MutuallyExclusive(DictRule):
+    """
+    At most one of the `props` is present (exactly one if `required`).
+    """
+
+    code = 'DICT_PROPS_EXCLUSIVE'
+
+    def __init__(self, props: [str], required: bool = False):
+        super(MutuallyExclusive, self).__init__(props)
+        self.required = required
+
+    def check(self, values: dict) -> bool:
+        count = sum(1 for prop in self.props if _is_present(values, prop))
+
+        return count == 1 if self.required else count <= 1
+
+    def extra(self, values: dict) -> dict:
+        return {'props': list(self.props), 'present': [prop for prop in self.props if _is_present(values, prop)]}
+
+
+class PredicateRule(DictRule):
+    """
+    Fails if `predicate(values)` is falsy, skipped if one of the props is missing,
+    ex: `PredicateRule(['items', 'total'], lambda values: sum(values['items']) == values['total'])`.
+    """
+
+    def __init__(self, props: [str], predicate, code: str = 'DICT_RULE', prop: str = None):
+        super(PredicateRule, self).__init__(props)
+        self.predicate = predicate
+        self.code = code
+        self.prop = prop
+
+    def check(self, values: dict) -> bool:
+        if not all(_is_present(values, prop) for prop in self.props):
+            return True
+
+        return bool(self.predicate(values))
+
+
 class DictField(BaseField):
-    def __init__(self, schema: dict, optional_props: [str] = [], strict: bool = False, *args, **kwargs):
+    memoizable = True
+
+    # number of validations between two reorders of the props in adaptive mode
+    adaptive_interval: int = 1000
+
+    def __init__(self, schema: dict, optional_props: [str] = [], strict: bool = False, target=None,
+                 adaptive: bool = False, rules: [DictRule] = None, *args, **kwargs):
         super(DictField, self).__init__(*args, **kwargs)
         self.schema = schema
         self.optional_props = optional_props
         self.strict = strict
+        self.target = target
+        self.constructor = _build_constructor(target, self.schema_optional_props())
+        self.builds = target is not None or any(field.builds for field in schema.values())
+
+        # the props and the rules, each rule right after the last of its props
+        self.rules = rules or []
+        self.steps = self.build_steps(list(schema))
+
+        self.adaptive = adaptive
+        self.adaptive_runs = 0
+        self.prop_failures = dict.fromkeys(schema, 0)
+        self.apply_prop_order(list(schema))
+
+    def schema_optional_props(self) -> [str]:
+        return [prop for prop in self.schema if prop in self.optional_props]
+
+    def apply_prop_order(self, prop_order: list):
+        """
+        Sets the order of the props checks in adaptive mode.
+        """
+        self.prop_order = prop_order
+        self.step_order = self.build_steps(prop_order)
+        self.step_rank = {step: rank for rank, step in enumerate(self.step_order)}
+
+    def build_steps(self, prop_order: list) -> list:
+        """
+        Returns the props of `prop_order` with each rule right after the last of its props,
+        the rules of props out of the schema are at the end.
+        """
+        prop_rank = {key: rank for rank, key in enumerate(prop_order)}
+        rules_after = {}
+        last_rules = []
+
+        for rule in self.rules:
+            if rule.props and all(prop in prop_rank for prop in rule.props):
+                last_prop = max(rule.props, key=prop_rank.get)
+                rules_after.setdefault(last_prop, []).append(rule)
+            else:
+                last_rules.append(rule)
+
+        steps = []
+
+        for key in prop_order:
+            steps.append(key)
+            steps.extend(rules_after.get(key, []))
+
+        return steps + last_rules
+
+    def reorder_props(self):
+        """
+        Moves the props that fail more often to the start, the scalar fields
+        before the (more expensive) container fields.
+        """
+        schema_rank = {key: rank for rank, key in enumerate(self.schema)}
+
+        self.apply_prop_order(sorted(
+            self.schema,
+            key=lambda key: (
+                -self.prop_failures.get(key, 0),
+                _is_container(self.schema[key]),
+                schema_rank[key]
+            )
+        ))
+
+        # older failures weight less at each reorder
+        self.prop_failures = {key: self.prop_failures.get(key, 0) // 2 for key in self.schema}
+        self.adaptive_runs = 0
+
+    def __getstate__(self):
+        state = super(DictField, self).__getstate__()
+        state['constructor'] = None
+
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.constructor = _build_constructor(self.target, self.schema_optional_props())
 
     def validator(self):
-        if type(self.value) is not dict:
+        value = self.value
+        builds = self.builds
+
+        if type(value) is not dict:
             self.raise_error(
                 'DICT_TYPE'
             )
 
         if self.strict:
-            for value_prop_key in self.value:
+            for value_prop_key in value:
                 if value_prop_key not in self.schema and value_prop_key not in self.optional_props:
                     self.raise_error(
                         'DICT_PROP_NOT_ALLOWED',
                         extra={'prop': value_prop_key}
                     )
 
-        for schema_prop_key in self.schema:
-            if schema_prop_key not in self.value:
-                if schema_prop_key in self.optional_props:
-                    continue
-                else:
-                    self.raise_error(
-                        'DICT_PROP_MISSING',
-                        extra={'prop': schema_prop_key}
-                    )
+        # without a target the unknown props are kept, like the input
+        values = None
 
-            prop_field = self.schema[schema_prop_key]
+        if builds:
+            values = {} if self.target is not None else dict(value)
 
-            self.ctx.add_to_path(schema_prop_key)
+        if self.adaptive:
+            self.validate_props_adaptive(value, values)
+        elif self.rules:
+            for step in self.steps:
+                self.validate_step(step, value, values)
+        else:
+            for schema_prop_key in self.schema:
+                self.validate_prop(schema_prop_key, value, values)
 
-            prop_field.value = self.value[schema_prop_key]
-            prop_field.ctx = self.ctx
+        if builds:
+            self.value = values if self.constructor is None else self.constructor(values)
 
-            prop_field.validate()
+    def validate_prop(self, schema_prop_key, value: dict, values: dict):
+        if schema_prop_key not in value:
+            if schema_prop_key in self.optional_props:
+                return
+            else:
+                self.raise_error(
+                    'DICT_PROP_MISSING',
+                    extra={'prop': schema_prop_key}
+                )
 
-            self.ctx.pop_path()
+        prop_field = self.schema[schema_prop_key]
+
+        self.ctx.add_to_path(schema_prop_key)
+
+        prop_field.value = value[schema_prop_key]
+        prop_field.ctx = self.ctx
+
+        prop_value = prop_field.validate()
+
+        if values is not None:
+            values[schema_prop_key] = prop_value
+
+        self.ctx.pop_path()
+
+    def validate_rule(self, rule: DictRule, value: dict, values: dict):
+        # the rules see the validated values, if the props build new ones
+        source = value if values is None else values
+
+        if rule.check(source):
+            return
+
+        if rule.prop is not None:
+            self.ctx.add_to_path(rule.prop)
+
+        self.raise_error(
+            rule.code,
+            extra=rule.extra(source)
+        )
+
+    def validate_step(self, step, value: dict, values: dict):
+        if isinstance(step, DictRule):
+            self.validate_rule(step, value, values)
+        else:
+            self.validate_prop(step, value, values)
+
+    def validate_props_adaptive(self, value: dict, values: dict):
+        ctx = self.ctx
+        path_length = len(ctx.path)
+
+        self.adaptive_runs += 1
+
+        if self.adaptive_runs >= self.adaptive_interval:
+            self.reorder_props()
+
+        step_rank = self.step_rank
+
+        for step in self.step_order:
+            try:
+                self.validate_step(step, value, values)
+            except SchemaValidationError:
+                if not isinstance(step, DictRule):
+                    self.prop_failures[step] += 1
+
+                # to keep the reported error deterministic, the props (and rules) before the
+                # failed one in the schema order that were not checked yet are validated, the
+                # first failure in the schema order is the one raised
+                del ctx.path[path_length:]
+
+                for schema_step in self.steps:
+                    if schema_step == step:
+                        break
+
+                    if step_rank[schema_step] > step_rank[step]:
+                        self.validate_step(schema_step, value, values)
+
+                raise
+
+
+class _Missing:
+    pass
+
+
+_MISSING = _Missing()
+
+
+# 1, True and 1.0 are equal (and hash the same), but they are different values for the fields
+_NUMBER_TYPES = {bool, int, float}
+
+
+def _canonical_key(value):
+    """
+    Returns a hashable key for unhashable values (dicts, lists, sets),
+    equal values result in equal keys.
+    """
+    value_type = type(value)
+
+    if value_type in _NUMBER_TYPES:
+        return value_type, value
+
+    if value_type is dict:
+        return _Missing, dict, frozenset((key, _canonical_key(item)) for key, item in value.items())
+
+    if value_type is list or value_type is tuple:
+        return _Missing, list, tuple(_canonical_key(item) for item in value)
+
+    if value_type is set:
+        return _Missing, set, frozenset(_canonical_key(item) for item in value)
+
+    return value
 
 
 class ListField(BaseField):
-    def __init__(self, item_schema: BaseField, min_items: int = None, max_items: int = None, *args, **kwargs):
+    memoizable = True
+
+    def __init__(self, item_schema: BaseField, min_items: int = None, max_items: int = None,
+                 unique_items: bool = False, unique_by=None, lazy: bool = False, *args, **kwargs):
         super(ListField, self).__init__(*args, **kwargs)
         self.item_schema = item_schema
         self.min_items = min_items
         self.max_items = max_items
+        self.unique_items = unique_items
+        self.unique_by = unique_by
+        self.lazy = lazy
+        self.builds = item_schema.builds
+
+        if lazy:
+            # the validated value is the iterator that validates the items
+            self.builds = True
+            self.memoizable = False
+
+    def unique_key(self, item):
+        unique_by = self.unique_by
+
+        if unique_by is None:
+            return item
+
+        if isinstance(unique_by, str):
+            if type(item) is dict:
+                return item.get(unique_by, _MISSING)
+
+            return getattr(item, unique_by, _MISSING)
+
+        return unique_by(item)
+
+    def first_index(self, seen: dict, item, index: int):
+        """
+        Returns the index of the first item with the same unique key of `item`.
+        """
+        key = self.unique_key(item)
+
+        if key is _MISSING:
+            return index
+
+        if type(key) in _NUMBER_TYPES:
+            return seen.setdefault((type(key), key), index)
+
+        try:
+            return seen.setdefault(key, index)
+        except TypeError:
+            return seen.setdefault(_canonical_key(key), index)
 
     def validator(self):
-        if type(self.value) is not list:
+        value = self.value
+        builds = self.builds
+        unique = self.unique_items or self.unique_by is not None
+
+        if self.lazy:
+            self.validate_lazy(value)
+            return
+
+        if type(value) is not list:
             self.raise_error(
                 'LIST_TYPE'
             )
 
-        if self.min_items is not None and len(self.value) < self.min_items:
+        if self.min_items is not None and len(value) < self.min_items:
             self.raise_error(
                 'LIST_MIN_ITEMS'
             )
 
-        if self.max_items is not None and len(self.value) > self.max_items:
+        if self.max_items is not None and len(value) > self.max_items:
             self.raise_error(
                 'LIST_MAX_ITEMS'
             )
 
-        for index, item in enumerate(self.value):
+        if builds:
+            items = []
+
+        if unique:
+            # key -> index of the first item with the key
+            seen = {}
+
+        aggregate = self.ctx.report is not None
+
+        for index, item in enumerate(value):
             self.ctx.add_to_path('${}'.format(index))
 
             self.item_schema.value = item
             self.item_schema.ctx = self.ctx
-            self.item_schema.validate()
+
+            if aggregate:
+                item_value = self.validate_item_aggregated(index)
+            else:
+                item_value = self.item_schema.validate()
+
+            if builds:
+                items.append(item_value)
 
             self.ctx.pop_path()
 
+            if unique:
+                first_index = self.first_index(seen, item, index)
+
+                if first_index != index:
+                    extra = {
+                        'index': index,
+                        'first_index': first_index
+                    }
+
+                    if not aggregate:
+                        self.raise_error(
+                            'LIST_DUPLICATE_ITEM',
+                            extra=extra
+                        )
+
+                    self.ctx.report.add(
+                        SchemaValidationError('LIST_DUPLICATE_ITEM', self.ctx.path, self, extra),
+                        self.ctx.list_indexes,
+                        sample=item,
+                        example=tuple(list_index for _, list_index in self.ctx.list_indexes) + (index,)
+                    )
+
+        if builds:
+            self.value = items
+
+    def validate_item_aggregated(self, index: int):
+        """
+        Validates the current item, recording the error in the report of the
+        validator instead of raising it.
+        """
+        ctx = self.ctx
+        path_length = len(ctx.path)
+
+        ctx.list_indexes.append((path_length - 1, index))
+
+        try:
+            return self.item_schema.validate()
+        except SchemaValidationError as err:
+            ctx.record_error(err)
+            del ctx.path[path_length:]
+        finally:
+            ctx.list_indexes.pop()
+
+    def validate_lazy(self, value):
+        if isinstance(value, (str, bytes, dict)):
+            self.raise_error(
+                'LIST_TYPE'
+            )
+
+        try:
+            iterator = iter(value)
+        except TypeError:
+            self.raise_error(
+                'LIST_TYPE'
+            )
+
+        self.value = LazyItems(self, self.ctx, iterator)
+
+
+class LazyItems:
+    """
+    Iterator returned by the validation of a lazy ListField, each item is validated
+    when it's pulled.
+    """
+
+    def __init__(self, field: ListField, ctx: SchemaValidator, iterator):
+        self.field = field
+        self.iterator = iterator
+        self.path = list(ctx.path)
+        self.or_depth = ctx.or_depth
+        self.max_or_depth = ctx.max_or_depth
+        self.index = 0
+        self.seen = {} if field.unique_items or field.unique_by is not None else None
+
+    def __iter__(self):
+        return self
+
+    def raise_error(self, code: str, extra=None):
+        raise SchemaValidationError(
+            code=code,
+            path=self.path,
+            node=self.field,
+            extra=extra
+        )
+
+    def __next__(self):
+        field = self.field
+        index = self.index
+
+        try:
+            item = next(self.iterator)
+        except StopIteration:
+            if field.min_items is not None and index < field.min_items:
+                self.raise_error(
+                    'LIST_MIN_ITEMS'
+                )
+
+            raise
+
+        if field.max_items is not None and index >= field.max_items:
+            self.raise_error(
+                'LIST_MAX_ITEMS'
+            )
+
+        # advanced before the validation, so the next items keep their index after an error
+        self.index = index + 1
+
+        validator = SchemaValidator(
+            schema=field.item_schema,
+            value=item
+        )
+        validator.path = self.path + ['${}'.format(index)]
+        validator.or_depth = self.or_depth
+        validator.max_or_depth = self.max_or_depth
+        validator.tracker = None
+
+        item_value = validator.validate()
+
+        if self.seen is not None:
+            first_index = field.first_index(self.seen, item, index)
+
+            if first_index != index:
+                self.raise_error(
+                    'LIST_DUPLICATE_ITEM',
+                    extra={
+                        'index': index,
+                        'first_index': first_index
+                    }
+                )
+
+        return item_value
+
 
 class EnumField(BaseField):
     def __init__(self, accept: [any], *args, **kwargs):
@@ -242,33 +1130,447 @@ class RegexField(BaseField):
 
 
 class OrField(BaseField):
-    def __init__(self, schemas: [BaseField], *args, **kwargs):
+    memoizable = True
+
+    # class level defaults, None means unlimited
+    max_errors: int = None
+    max_error_depth: int = None
+
+    # number of validations between two reorders of the branches in adaptive mode
+    adaptive_interval: int = 1000
+
+    def __init__(self, schemas: [BaseField], max_errors: int = None, max_error_depth: int = None,
+                 adaptive: bool = False, *args, **kwargs):
         super(OrField, self).__init__(*args, **kwargs)
         self.schemas = schemas
+        self.builds = any(sc.builds for sc in schemas)
+
+        if max_errors is not None:
+            self.max_errors = max_errors
+
+        if max_error_depth is not None:
+            self.max_error_depth = max_error_depth
+
+        self.adaptive = adaptive
+        self.adaptive_runs = 0
+        self.branch_order = list(range(len(schemas)))
+        self.branch_matches = [0] * len(schemas)
+
+    def reorder_branches(self):
+        """
+        Moves the branches that match more often to the start.
+        """
+        self.branch_order = sorted(
+            range(len(self.schemas)),
+            key=lambda index: (-self.branch_matches[index], index)
+        )
+
+        # older matches weight less at each reorder
+        self.branch_matches = [matches // 2 for matches in self.branch_matches]
+        self.adaptive_runs = 0
+
+    def error_depth_limit(self):
+        """
+        Returns the max OrField depth that keeps errors, the tightest limit
+        of the enclosing OrFields wins.
+        """
+        max_or_depth = self.ctx.max_or_depth
+
+        if self.max_error_depth is not None:
+            own_max_or_depth = self.ctx.or_depth + self.max_error_depth
+
+            if max_or_depth is None or own_max_or_depth < max_or_depth:
+                max_or_depth = own_max_or_depth
+
+        return max_or_depth
 
     def validator(self):
         value = self.value
+        max_errors = self.max_errors
+        max_or_depth = self.error_depth_limit()
+
+        keep_errors = max_or_depth is None or self.ctx.or_depth < max_or_depth
+
         schemas = self.schemas
+        # the branches that build objects can't be reordered, the first match in the
+        # schemas order decides the returned object
+        adaptive = self.adaptive and not self.builds
+
+        if adaptive:
+            self.adaptive_runs += 1
+
+            if self.adaptive_runs >= self.adaptive_interval:
+                self.reorder_branches()
 
+            order = self.branch_order
+        else:
+            order = range(len(schemas))
+
+        # (branch index, error)
         errors = []
 
-        for sc in schemas:
+        for index in order:
             try:
-                validator = SchemaValidator(
-                    schema=sc,
-                    value=value
+                validator = self.ctx.branch(
+                    schema=schemas[index],
+                    value=value,
+                    max_or_depth=max_or_depth
                 )
-                validator.validate()
+                self.value = validator.validate()
+
+                if adaptive:
+                    self.branch_matches[index] += 1
 
                 return
             except SchemaValidationError as sve:
-                errors.append(sve)
+                if keep_errors and (adaptive or max_errors is None or len(errors) < max_errors):
+                    errors.append((index, sve))
+
+        if adaptive:
+            # the errors are always reported in the schemas order
+            errors.sort(key=lambda error: error[0])
+
+        if max_errors is not None:
+            errors = errors[:max_errors]
+
+        self.raise_error(
+            code='OR_NO_MATCHING_SCHEMA',
+            extra={
+                'errors': [sve for _, sve in errors],
+                'dropped_errors': len(schemas) - len(errors)
+            }
+        )
+
+
+class RegexUnionField(OrField):
+    """
+    An OrField of RegexFields checked with a single regex, an alternation of the
+    branches patterns in named groups.
+    """
+
+    def __init__(self, schemas: [RegexField], *args, **kwargs):
+        super(RegexUnionField, self).__init__(schemas, *args, **kwargs)
+
+        self.pattern = re.compile('|'.join(
+            '(?P<branch_{}>{})'.format(index, getattr(sc.regex, 'pattern', sc.regex))
+            for index, sc in enumerate(schemas)
+        ))
+
+    def match_branch(self, value: str):
+        """
+        Returns the index of the first branch that matches the value, or None.
+        """
+        match = self.pattern.match(value)
+
+        if match is None:
+            return None
+
+        return int(match.lastgroup[len('branch_'):])
+
+    def validator(self):
+        value = self.value
+
+        if value is not None and self.pattern.match(value) is not None:
+            return
+
+        max_errors = self.max_errors
+        max_or_depth = self.error_depth_limit()
+
+        errors = []
+
+        if max_or_depth is None or self.ctx.or_depth < max_or_depth:
+            code = 'REQUIRED_VALUE' if value is None else 'REGEX_NOT_MATCH'
+
+            errors = [
+                SchemaValidationError(code=code, path=('$root',), node=sc)
+                for sc in self.schemas[:max_errors]
+            ]
+
+        self.raise_error(
+            code='OR_NO_MATCHING_SCHEMA',
+            extra={
+                'errors': errors,
+                'dropped_errors': len(self.schemas) - len(errors)
+            }
+        )
+
+
+_DECIMAL_DIGITS = frozenset('0123456789')
+_HEX_DIGITS = frozenset('0123456789abcdefABCDEF')
+_EMAIL_LOCAL_CHARS = frozenset("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789!#$%&'*+/=?^_`{|}~-.")
+_DOMAIN_LABEL_CHARS = frozenset('abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789-')
+_URI_SCHEME_CHARS = frozenset('abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789+-.')
+
+
+def _read_digits(value: str, start: int, count: int):
+    """
+    Returns the int of the `count` ascii digits at `start`, or None.
+    """
+    digits = value[start:start + count]
+
+    if len(digits) != count or not _DECIMAL_DIGITS.issuperset(digits):
+        return None
+
+    return int(digits)
+
+
+def _parse_iso_date(value: str, start: int = 0):
+    """
+    Returns the date of the YYYY-MM-DD at `start`, or None.
+    """
+    year = _read_digits(value, start, 4)
+    month = _read_digits(value, start + 5, 2)
+    day = _read_digits(value, start + 8, 2)
+
+    if year is None or month is None or day is None or value[start + 4] != '-' or value[start + 7] != '-':
+        return None
+
+    try:
+        return datetime.date(year, month, day)
+    except ValueError:
+        return None
+
+
+def _parse_iso_datetime(value: str):
+    """
+    Returns the datetime of an ISO-8601 string: YYYY-MM-DD(T| )HH:MM[:SS[.fraction]][Z|(+|-)HH[:][MM]], or None.
+
+    The string is scanned once, without regex.
+    """
+    parsed_date = _parse_iso_date(value)
+
+    if parsed_date is None or len(value) < 16 or value[10] not in 'Tt ':
+        return None
+
+    hour = _read_digits(value, 11, 2)
+    minute = _read_digits(value, 14, 2)
+
+    if hour is None or minute is None or value[13] != ':':
+        return None
+
+    second = 0
+    microsecond = 0
+    position = 16
+    length = len(value)
+
+    if position < length and value[position] == ':':
+        second = _read_digits(value, position + 1, 2)
+
+        if second is None:
+            return None
+
+        position += 3
+
+        if position < length and value[position] in '.,':
+            fraction_start = position + 1
+            position = fraction_start
+
+            while position < length and value[position] in _DECIMAL_DIGITS:
+                position += 1
+
+            fraction = value[fraction_start:position]
+
+            if not fraction or len(fraction) > 9:
+                return None
+
+            microsecond = int(fraction[:6].ljust(6, '0'))
+
+    tzinfo = None
+
+    if position < length:
+        sign = value[position]
+
+        if sign in 'Zz' and position + 1 == length:
+            tzinfo = datetime.timezone.utc
+        elif sign in '+-':
+            offset = value[position + 1:]
+            offset_hour = _read_digits(offset, 0, 2)
+
+            if len(offset) == 2:
+                offset_minute = 0
+            elif len(offset) == 4:
+                offset_minute = _read_digits(offset, 2, 2)
+            elif len(offset) == 5 and offset[2] == ':':
+                offset_minute = _read_digits(offset, 3, 2)
+            else:
+                return None
+
+            if offset_hour is None or offset_minute is None or offset_hour > 23 or offset_minute > 59:
+                return None
+
+            delta = datetime.timedelta(hours=offset_hour, minutes=offset_minute)
+            tzinfo = datetime.timezone(-delta if sign == '-' else delta)
+        else:
+            return None
+
+    try:
+        return datetime.datetime(
+            parsed_date.year, parsed_date.month, parsed_date.day,
+            hour, minute, second, microsecond, tzinfo
+        )
+    except ValueError:
+        return None
+
+
+class FormatField(BaseField):
+    """
+    Base of the fields that validate a formatted string with a parser.
+
+    Raises `<code>_TYPE` if the value is not a str and `<code>_FORMAT` if it can't be parsed.
+    If `coerce` is True, the validation returns the parsed object.
+    """
+
+    code: str = None
+
+    def __init__(self, coerce: bool = False, *args, **kwargs):
+        super(FormatField, self).__init__(*args, **kwargs)
+        self.coerce = coerce
+        self.builds = coerce
+
+    def parse(self, value: str):
+        """
+        Returns the parsed value, or None if the value is invalid.
+        """
+        raise NotImplementedError()
+
+    def validator(self):
+        value = self.value
+
+        if type(value) is not str:
+            self.raise_error(
+                '{}_TYPE'.format(self.code)
+            )
+
+        parsed = self.parse(value)
+
+        if parsed is None:
+            self.raise_error(
+                '{}_FORMAT'.format(self.code)
+            )
+
+        if self.coerce:
+            self.value = parsed
+
+
+class UUIDField(FormatField):
+    code = 'UUID'
+
+    def parse(self, value: str):
+        if len(value) != 36 or value[8] != '-' or value[13] != '-' or value[18] != '-' or value[23] != '-':
+            return None
+
+        if not _HEX_DIGITS.issuperset(value[:8] + value[9:13] + value[14:18] + value[19:23] + value[24:]):
+            return None
+
+        return uuid.UUID(value) if self.coerce else value
+
+
+class DateTimeField(FormatField):
+    code = 'DATETIME'
+
+    def __init__(self, require_timezone: bool = False, *args, **kwargs):
+        super(DateTimeField, self).__init__(*args, **kwargs)
+        self.require_timezone = require_timezone
+
+    def parse(self, value: str):
+        parsed = _parse_iso_datetime(value)
+
+        if parsed is not None and self.require_timezone and parsed.tzinfo is None:
+            return None
+
+        return parsed
+
+
+class DateField(FormatField):
+    code = 'DATE'
+
+    def parse(self, value: str):
+        if len(value) != 10:
+            return None
+
+        return _parse_iso_date(value)
+
+
+class EmailField(FormatField):
+    code = 'EMAIL'
+
+    def parse(self, value: str):
+        at = value.rfind('@')
+        local = value[:at]
+        domain = value[at + 1:]
+
+        if at < 1 or len(local) > 64 or len(domain) > 253:
+            return None
+
+        if not _EMAIL_LOCAL_CHARS.issuperset(local) or local[0] == '.' or local[-1] == '.' or '..' in local:
+            return None
+
+        labels = domain.split('.')
+
+        if len(labels) < 2 or _DECIMAL_DIGITS.issuperset(labels[-1]):
+            return None
+
+        for label in labels:
+            if not label or len(label) > 63 or label[0] == '-' or label[-1] == '-':
+                return None
+
+            if not _DOMAIN_LABEL_CHARS.issuperset(label):
+                return None
+
+        return value
+
+
+class IPField(FormatField):
+    code = 'IP'
+
+    def __init__(self, version: int = None, *args, **kwargs):
+        super(IPField, self).__init__(*args, **kwargs)
+        self.version = version
+
+    def parse(self, value: str):
+        try:
+            address = ipaddress.ip_address(value)
+        except ValueError:
+            return None
+
+        if self.version is not None and address.version != self.version:
+            self.raise_error(
+                'IP_VERSION'
+            )
+
+        return address
+
+
+class URIField(FormatField):
+    code = 'URI'
+
+    def __init__(self, schemes: [str] = None, require_host: bool = False, *args, **kwargs):
+        super(URIField, self).__init__(*args, **kwargs)
+        self.schemes = None if schemes is None else [scheme.lower() for scheme in schemes]
+        self.require_host = require_host
+
+    def parse(self, value: str):
+        colon = value.find(':')
+        scheme = value[:colon]
+
+        if colon < 1 or not scheme[0].isalpha() or not _URI_SCHEME_CHARS.issuperset(scheme):
+            return None
+
+        if not value.isprintable() or ' ' in value:
+            return None
+
+        try:
+            parts = urlsplit(value)
+        except ValueError:
+            return None
+
+        if self.require_host and not parts.hostname:
+            return None
 
-        if len(schemas) == len(errors):
+        if self.schemes is not None and parts.scheme not in self.schemes:
             self.raise_error(
-                code='OR_NO_MATCHING_SCHEMA',
-                extra={
-                    'errors': errors
-                }
+                'URI_SCHEME',
+                extra={'scheme': parts.scheme}
             )
 
+        return parts
@@ -1,8 +1,15 @@
+import ipaddress
+import pickle
+import uuid
+from collections import namedtuple
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
 from unittest import TestCase
 
-from py_schema import SchemaValidator, SchemaValidationError, \
+from py_schema import SchemaValidator, SchemaValidationError, BaseField, \
     IntField, StrField, BoolField, FloatField, DictField, ListField, \
-    EnumField, RegexField, OrField
+    EnumField, RegexField, OrField, UUIDField, DateTimeField, DateField, EmailField, IPField, URIField, \
+    Compare, RequiredIf, MutuallyExclusive, PredicateRule
 
 
 class SchemaValidatorTest(TestCase):
@@ -51,6 +58,49 @@ class SchemaValidatorTest(TestCase):
                 age_field
             )
 
+    def test_error_should_keep_path_items_and_message(self):
+        schema = DictField(
+            schema={
+                'age': IntField(min=18)
+            }
+        )
+
+        try:
+            SchemaValidator(schema, {'age': 12}).validate()
+            self.fail()
+        except SchemaValidationError as err:
+            self.assertEqual(
+                err.path_items,
+                ('$root', 'age')
+            )
+            self.assertEqual(
+                str(err),
+                'INT_MIN at $root.age'
+            )
+
+    def test_error_should_not_keep_node_alive(self):
+        err = SchemaValidationError(
+            code='INT_MIN',
+            path=('$root',),
+            node=IntField()
+        )
+
+        self.assertIsNone(err.node)
+
+    def test_error_should_be_picklable(self):
+        err = SchemaValidationError(
+            code='DICT_PROP_MISSING',
+            path='$root.foo',
+            node=None,
+            extra={'prop': 'bar'}
+        )
+
+        loaded = pickle.loads(pickle.dumps(err))
+
+        self.assertEqual(loaded.code, 'DICT_PROP_MISSING')
+        self.assertEqual(loaded.path, '$root.foo')
+        self.assertEqual(loaded.extra, {'prop': 'bar'})
+
     def test_full_schema_should_pass(self):
         schema = ListField(
             min_items=1,
@@ -773,3 +823,963 @@ class OrFieldTest(TestCase):
 
         validator = SchemaValidator(schema, value)
         validator.validate()
+
+    def test_max_errors_should_drop_extra_errors(self):
+        schema = OrField(
+            schemas=[
+                StrField(),
+                IntField(),
+                FloatField()
+            ],
+            max_errors=1
+        )
+
+        try:
+            SchemaValidator(schema, True).validate()
+            self.fail()
+        except SchemaValidationError as e:
+            self.assertEqual(
+                1,
+                len(e.extra['errors'])
+            )
+            self.assertEqual(
+                2,
+                e.extra['dropped_errors']
+            )
+
+    def test_max_error_depth_should_drop_nested_errors(self):
+        schema = OrField(
+            schemas=[
+                StrField(),
+                OrField(
+                    schemas=[
+                        IntField(),
+                        FloatField()
+                    ]
+                )
+            ],
+            max_error_depth=1
+        )
+
+        try:
+            SchemaValidator(schema, True).validate()
+            self.fail()
+        except SchemaValidationError as e:
+            nested = e.extra['errors'][1]
+
+            self.assertEqual(
+                nested.code, 'OR_NO_MATCHING_SCHEMA'
+            )
+            self.assertEqual(
+                [],
+                nested.extra['errors']
+            )
+            self.assertEqual(
+                2,
+                nested.extra['dropped_errors']
+            )
+
+
+class Point:
+    __slots__ = ('x', 'y')
+
+
+class Profile:
+    def __init__(self, name, tags, address=None):
+        self.name = name
+        self.tags = tags
+        self.address = address
+
+
+Tag = namedtuple('Tag', ['label'])
+
+
+@dataclass
+class Address:
+    street: str
+    number: int = 0
+
+
+class TargetTest(TestCase):
+    def test_dict_without_target_should_return_value(self):
+        value = {'x': 1}
+
+        result = SchemaValidator(DictField(schema={'x': IntField()}), value).validate()
+
+        self.assertIs(result, value)
+
+    def test_dataclass_target_should_be_built(self):
+        schema = DictField(
+            schema={
+                'street': StrField(),
+                'number': IntField()
+            },
+            optional_props=['number'],
+            target=Address
+        )
+
+        result = SchemaValidator(schema, {'street': 'Dark Road'}).validate()
+
+        self.assertEqual(result, Address(street='Dark Road'))
+
+    def test_missing_optional_prop_without_default_should_be_none(self):
+        @dataclass
+        class Range:
+            start: int
+            end: int
+
+        schema = DictField(
+            schema={
+                'start': IntField(),
+                'end': IntField()
+            },
+            optional_props=['end'],
+            target=Range
+        )
+
+        result = SchemaValidator(schema, {'start': 1}).validate()
+
+        self.assertEqual(result, Range(start=1, end=None))
+
+    def test_missing_optional_prop_of_slots_target_should_be_none(self):
+        schema = DictField(
+            schema={
+                'x': IntField(),
+                'y': IntField()
+            },
+            optional_props=['y'],
+            target=Point
+        )
+
+        result = SchemaValidator(schema, {'x': 1}).validate()
+
+        self.assertEqual((result.x, result.y), (1, None))
+
+    def test_slots_target_should_be_built(self):
+        schema = DictField(
+            schema={
+                'x': IntField(),
+                'y': IntField()
+            },
+            target=Point
+        )
+
+        result = SchemaValidator(schema, {'x': 1, 'y': 2}).validate()
+
+        self.assertIsInstance(result, Point)
+        self.assertEqual((result.x, result.y), (1, 2))
+
+    def test_nested_targets_should_be_built(self):
+        schema = ListField(
+            item_schema=DictField(
+                schema={
+                    'name': StrField(),
+                    'tags': ListField(
+                        item_schema=DictField(
+                            schema={'label': StrField()},
+                            target=Tag
+                        )
+                    ),
+                    'address': OrField(
+                        schemas=[
+                            BoolField(),
+                            DictField(
+                                schema={'street': StrField()},
+                                target=Address
+                            )
+                        ]
+                    )
+                },
+                target=Profile
+            )
+        )
+
+        value = [
+            {
+                'name': 'Rhapsody',
+                'tags': [{'label': 'power'}, {'label': 'metal'}],
+                'address': {'street': 'Emerald Sword'}
+            }
+        ]
+
+        result = SchemaValidator(schema, value).validate()
+
+        self.assertIsInstance(result[0], Profile)
+        self.assertEqual(result[0].tags, [Tag('power'), Tag('metal')])
+        self.assertEqual(result[0].address, Address(street='Emerald Sword'))
+
+    def test_dict_with_nested_target_should_keep_unknown_props(self):
+        schema = DictField(
+            schema={
+                'point': DictField(
+                    schema={'x': IntField(), 'y': IntField()},
+                    target=Point
+                )
+            }
+        )
+
+        value = {'point': {'x': 1, 'y': 2}, 'other': True}
+
+        result = SchemaValidator(schema, value).validate()
+
+        self.assertIsNot(result, value)
+        self.assertTrue(result['other'])
+        self.assertIsInstance(result['point'], Point)
+
+
+class ListUniqueTest(TestCase):
+    def assert_duplicate(self, schema, value, first_index, index):
+        try:
+            SchemaValidator(schema, value).validate()
+            self.fail()
+        except SchemaValidationError as e:
+            self.assertEqual(
+                e.path, '$root'
+            )
+            self.assertEqual(
+                e.code, 'LIST_DUPLICATE_ITEM'
+            )
+            self.assertEqual(
+                e.extra,
+                {'index': index, 'first_index': first_index}
+            )
+
+    def test_duplicate_item_should_raise_error(self):
+        schema = ListField(
+            item_schema=IntField(),
+            unique_items=True
+        )
+
+        self.assert_duplicate(schema, [1, 2, 3, 2], 1, 3)
+
+    def test_numbers_of_other_types_should_not_be_duplicates(self):
+        schema = ListField(
+            item_schema=OrField(schemas=[IntField(), FloatField(), BoolField()]),
+            unique_items=True
+        )
+
+        self.assertEqual(SchemaValidator(schema, [1, True, 1.0]).validate(), [1, True, 1.0])
+        self.assert_duplicate(schema, [1, True, 1.0, True], 1, 3)
+
+    def test_nested_numbers_of_other_types_should_not_be_duplicates(self):
+        schema = ListField(
+            item_schema=DictField(schema={'n': OrField(schemas=[IntField(), BoolField()])}),
+            unique_items=True
+        )
+
+        self.assertEqual(len(SchemaValidator(schema, [{'n': 1}, {'n': True}]).validate()), 2)
+        self.assert_duplicate(schema, [{'n': 1}, {'n': True}, {'n': 1}], 0, 2)
+
+    def test_unique_items_should_pass(self):
+        schema = ListField(
+            item_schema=IntField(),
+            unique_items=True
+        )
+
+        SchemaValidator(schema, list(range(1000))).validate()
+
+    def test_duplicate_unhashable_item_should_raise_error(self):
+        schema = ListField(
+            item_schema=DictField(
+                schema={'tags': ListField(item_schema=StrField())}
+            ),
+            unique_items=True
+        )
+
+        value = [
+            {'tags': ['a', 'b']},
+            {'tags': ['b', 'a']},
+            {'tags': ['a', 'b']}
+        ]
+
+        self.assert_duplicate(schema, value, 0, 2)
+
+    def test_duplicate_prop_should_raise_error(self):
+        schema = ListField(
+            item_schema=DictField(
+                schema={
+                    'id': IntField(),
+                    'email': StrField()
+                },
+                optional_props=['email']
+            ),
+            unique_by='email'
+        )
+
+        value = [
+            {'id': 1, 'email': 'a@a.com'},
+            {'id': 2},
+            {'id': 3},
+            {'id': 4, 'email': 'a@a.com'}
+        ]
+
+        self.assert_duplicate(schema, value, 0, 3)
+
+    def test_duplicate_key_function_should_raise_error(self):
+        schema = ListField(
+            item_schema=StrField(),
+            unique_by=str.lower
+        )
+
+        self.assert_duplicate(schema, ['Link', 'Zelda', 'LINK'], 0, 2)
+
+
+class AdaptiveTest(TestCase):
+    def test_failing_prop_should_be_checked_first(self):
+        schema = DictField(
+            schema={
+                'nested': DictField(schema={}),
+                'name': StrField(),
+                'age': IntField(min=18)
+            },
+            adaptive=True
+        )
+        schema.adaptive_interval = 10
+
+        for _ in range(10):
+            try:
+                SchemaValidator(schema, {'nested': {}, 'name': 'Link', 'age': 12}).validate()
+            except SchemaValidationError:
+                pass
+
+        SchemaValidator(schema, {'nested': {}, 'name': 'Link', 'age': 18}).validate()
+
+        self.assertEqual(schema.prop_order, ['age', 'name', 'nested'])
+
+    def test_adaptive_error_should_follow_schema_order(self):
+        schema = DictField(
+            schema={
+                'name': StrField(),
+                'age': IntField(min=18)
+            },
+            adaptive=True
+        )
+        schema.apply_prop_order(['age', 'name'])
+
+        try:
+            SchemaValidator(schema, {'name': 123, 'age': 12}).validate()
+            self.fail()
+        except SchemaValidationError as e:
+            self.assertEqual(
+                e.path, '$root.name'
+            )
+            self.assertEqual(
+                e.code, 'STR_TYPE'
+            )
+
+        result = SchemaValidator(schema, {'name': 'Link', 'age': 18}).validate()
+
+        self.assertEqual(result, {'name': 'Link', 'age': 18})
+
+    def test_matching_branch_should_be_tried_first(self):
+        schema = OrField(
+            schemas=[
+                StrField(),
+                FloatField(),
+                IntField()
+            ],
+            adaptive=True
+        )
+        schema.adaptive_interval = 10
+
+        for _ in range(10):
+            SchemaValidator(schema, 5).validate()
+
+        self.assertEqual(schema.branch_order, [2, 0, 1])
+
+        try:
+            SchemaValidator(schema, True).validate()
+            self.fail()
+        except SchemaValidationError as e:
+            self.assertEqual(
+                [error.code for error in e.extra['errors']],
+                ['STR_TYPE', 'FLOAT_TYPE', 'INT_TYPE']
+            )
+
+    def test_building_branches_should_keep_schema_order(self):
+        @dataclass
+        class Positive:
+            x: int
+
+        @dataclass
+        class Any:
+            x: int
+
+        schema = OrField(
+            schemas=[
+                DictField(schema={'x': IntField(min=0)}, target=Positive),
+                DictField(schema={'x': IntField()}, target=Any)
+            ],
+            adaptive=True
+        )
+        schema.adaptive_interval = 10
+
+        for _ in range(10):
+            SchemaValidator(schema, {'x': -1}).validate()
+
+        self.assertEqual(SchemaValidator(schema, {'x': 1}).validate(), Positive(x=1))
+
+
+class CountingField(BaseField):
+    def __init__(self, on_validate=None, *args, **kwargs):
+        super(CountingField, self).__init__(*args, **kwargs)
+        self.calls = 0
+        self.on_validate = on_validate
+
+    def validator(self):
+        self.calls += 1
+
+        if self.on_validate:
+            self.on_validate()
+
+
+class MemoizeTest(TestCase):
+    def test_shared_value_should_be_validated_once(self):
+        counter = CountingField()
+        schema = ListField(
+            item_schema=DictField(
+                schema={
+                    'address': DictField(schema={'street': counter})
+                }
+            )
+        )
+
+        address = {'street': 'Dark Road'}
+        value = [{'address': address} for _ in range(1000)]
+
+        SchemaValidator(schema, value, memoize=True).validate()
+
+        self.assertEqual(counter.calls, 1)
+
+        SchemaValidator(schema, value).validate()
+
+        self.assertEqual(counter.calls, 1001)
+
+    def test_changed_value_should_be_validated_again(self):
+        address = {'street': 'Dark Road'}
+
+        def change_address():
+            address['street'] = 'Light Road'
+
+        counter = CountingField(on_validate=change_address)
+        schema = ListField(
+            item_schema=DictField(schema={'street': counter})
+        )
+
+        SchemaValidator(schema, [address, address], memoize=True).validate()
+
+        self.assertEqual(counter.calls, 2)
+
+    def test_changed_nested_value_should_be_validated_again(self):
+        shared = {'inner': {'n': 1}}
+
+        def change_inner():
+            shared['inner']['n'] = 'bad'
+
+        schema = ListField(
+            item_schema=DictField(
+                schema={
+                    'shared': DictField(schema={'inner': DictField(schema={'n': IntField()})}),
+                    'mark': CountingField(on_validate=change_inner)
+                }
+            )
+        )
+
+        try:
+            SchemaValidator(schema, [{'shared': shared, 'mark': 1}, {'shared': shared, 'mark': 2}], memoize=True).validate()
+            self.fail()
+        except SchemaValidationError as e:
+            self.assertEqual(
+                e.path, '$root.$1.shared.inner.n'
+            )
+            self.assertEqual(
+                e.code, 'INT_TYPE'
+            )
+
+    def test_memoized_invalid_value_should_raise_error(self):
+        schema = ListField(
+            item_schema=DictField(schema={'age': IntField(min=18)})
+        )
+
+        person = {'age': 12}
+
+        try:
+            SchemaValidator(schema, [person, person], memoize=True).validate()
+            self.fail()
+        except SchemaValidationError as e:
+            self.assertEqual(
+                e.path, '$root.$0.age'
+            )
+
+
+class LazyListTest(TestCase):
+    def test_items_after_an_error_should_keep_their_index(self):
+        schema = ListField(
+            item_schema=IntField(min=0),
+            lazy=True
+        )
+
+        items = SchemaValidator(schema, iter([1, -2, 3, -4])).validate()
+        codes = []
+
+        for _ in range(4):
+            try:
+                next(items)
+            except SchemaValidationError as e:
+                codes.append((e.code, e.path))
+
+        self.assertEqual(codes, [('INT_MIN', '$root.$1'), ('INT_MIN', '$root.$3')])
+
+    def test_generator_items_should_be_validated_when_pulled(self):
+        schema = ListField(
+            item_schema=IntField(min=0),
+            lazy=True
+        )
+
+        pulled = []
+
+        def numbers():
+            for number in [1, 2, -3, 4]:
+                pulled.append(number)
+                yield number
+
+        items = SchemaValidator(schema, numbers()).validate()
+
+        self.assertEqual(pulled, [])
+        self.assertEqual(next(items), 1)
+        self.assertEqual(next(items), 2)
+
+        try:
+            next(items)
+            self.fail()
+        except SchemaValidationError as e:
+            self.assertEqual(
+                e.path, '$root.$2'
+            )
+            self.assertEqual(
+                e.code, 'INT_MIN'
+            )
+
+    def test_max_items_should_raise_when_exceeded(self):
+        schema = ListField(
+            item_schema=IntField(),
+            max_items=2,
+            lazy=True
+        )
+
+        items = SchemaValidator(schema, iter(range(10))).validate()
+
+        try:
+            list(items)
+            self.fail()
+        except SchemaValidationError as e:
+            self.assertEqual(
+                e.code, 'LIST_MAX_ITEMS'
+            )
+            self.assertEqual(items.index, 2)
+
+    def test_min_items_should_raise_at_exhaustion(self):
+        schema = ListField(
+            item_schema=IntField(),
+            min_items=3,
+            lazy=True
+        )
+
+        items = SchemaValidator(schema, iter([1, 2])).validate()
+
+        try:
+            list(items)
+            self.fail()
+        except SchemaValidationError as e:
+            self.assertEqual(
+                e.code, 'LIST_MIN_ITEMS'
+            )
+
+    def test_nested_lazy_list_should_be_returned(self):
+        schema = DictField(
+            schema={
+                'rows': ListField(
+                    item_schema=DictField(schema={'id': IntField()}),
+                    unique_by='id',
+                    lazy=True
+                )
+            }
+        )
+
+        result = SchemaValidator(schema, {'rows': ({'id': i % 3} for i in range(5))}).validate()
+
+        self.assertEqual(next(result['rows']), {'id': 0})
+
+        try:
+            list(result['rows'])
+            self.fail()
+        except SchemaValidationError as e:
+            self.assertEqual(
+                e.path, '$root.rows'
+            )
+            self.assertEqual(
+                e.code, 'LIST_DUPLICATE_ITEM'
+            )
+            self.assertEqual(
+                e.extra,
+                {'index': 3, 'first_index': 0}
+            )
+
+    def test_not_iterable_should_raise_error(self):
+        schema = ListField(
+            item_schema=IntField(),
+            lazy=True
+        )
+
+        for value in [1, 'abc', {}]:
+            try:
+                SchemaValidator(schema, value).validate()
+                self.fail()
+            except SchemaValidationError as e:
+                self.assertEqual(
+                    e.code, 'LIST_TYPE'
+                )
+
+
+class AggregateTest(TestCase):
+    def test_errors_should_be_grouped_by_path_and_code(self):
+        schema = DictField(
+            schema={
+                'rows': ListField(
+                    item_schema=DictField(
+                        schema={
+                            'name': StrField(),
+                            'age': IntField(min=0),
+                            'tags': ListField(item_schema=StrField())
+                        }
+                    ),
+                    unique_by='name'
+                )
+            }
+        )
+        rows = [
+            {'name': 'row_{}'.format(index), 'age': -index - 1, 'tags': ['a', index]}
+            for index in range(10000)
+        ]
+        rows[5]['age'] = 'abc'
+        rows[7]['name'] = 'row_3'
+
+        try:
+            SchemaValidator(schema, {'rows': rows}, aggregate=True, max_examples=3).validate()
+            self.fail()
+        except SchemaValidationError as e:
+            self.assertEqual(
+                e.code, 'AGGREGATED_ERRORS'
+            )
+
+            report = e.extra['report']
+
+            self.assertEqual(
+                report.as_list(),
+                [
+                    {'path': '$root.rows.$*.age', 'code': 'INT_MIN', 'count': 9999,
+                     'examples': [(0,), (1,), (2,)], 'sample': -1},
+                    {'path': '$root.rows.$*.age', 'code': 'INT_TYPE', 'count': 1,
+                     'examples': [(5,)], 'sample': 'abc'},
+                    {'path': '$root.rows', 'code': 'LIST_DUPLICATE_ITEM', 'count': 1,
+                     'examples': [(7,)], 'sample': rows[7]},
+                ]
+            )
+            self.assertEqual(report.count, 10001)
+
+    def test_nested_list_errors_should_have_all_indexes(self):
+        schema = DictField(
+            schema={
+                'rows': ListField(
+                    item_schema=DictField(
+                        schema={
+                            'name': StrField(),
+                            'age': IntField(min=0),
+                            'tags': ListField(item_schema=StrField())
+                        }
+                    ),
+                    unique_by='name'
+                )
+            }
+        )
+        rows = [
+            {'name': 'row_{}'.format(index), 'age': 1, 'tags': ['a', index]}
+            for index in range(3)
+        ]
+
+        try:
+            SchemaValidator(schema, {'rows': rows}, aggregate=True).validate()
+            self.fail()
+        except SchemaValidationError as e:
+            group = e.extra['report'].as_list()[0]
+
+            self.assertEqual(group['path'], '$root.rows.$*.tags.$*')
+            self.assertEqual(group['examples'], [(0, 1), (1, 1), (2, 1)])
+
+    def test_memoized_values_should_report_each_occurrence(self):
+        schema = ListField(
+            item_schema=DictField(schema={'tags': ListField(item_schema=IntField())})
+        )
+        item = {'tags': [1, 'x', 'y']}
+
+        for memoize in [False, True]:
+            try:
+                SchemaValidator(schema, [item] * 4, aggregate=True, memoize=memoize).validate()
+                self.fail()
+            except SchemaValidationError as e:
+                self.assertEqual(e.extra['report'].count, 8)
+
+    def test_root_error_should_be_reported(self):
+        schema = DictField(
+            schema={
+                'rows': ListField(item_schema=IntField())
+            }
+        )
+
+        try:
+            SchemaValidator(schema, {}, aggregate=True).validate()
+            self.fail()
+        except SchemaValidationError as e:
+            self.assertEqual(
+                [(group['path'], group['code']) for group in e.extra['report'].as_list()],
+                [('$root', 'DICT_PROP_MISSING')]
+            )
+
+    def test_valid_value_should_pass(self):
+        schema = DictField(
+            schema={
+                'rows': ListField(
+                    item_schema=DictField(
+                        schema={
+                            'name': StrField(),
+                            'age': IntField(min=0),
+                            'tags': ListField(item_schema=StrField())
+                        }
+                    ),
+                    unique_by='name'
+                )
+            }
+        )
+        value = {'rows': [{'name': 'a', 'age': 1, 'tags': []}]}
+
+        result = SchemaValidator(schema, value, aggregate=True).validate()
+
+        self.assertIs(result, value)
+
+
+class FormatFieldTest(TestCase):
+    def assert_valid(self, schema, values):
+        for value in values:
+            SchemaValidator(schema, value).validate()
+
+    def assert_invalid(self, schema, values, code):
+        for value in values:
+            try:
+                SchemaValidator(schema, value).validate()
+                self.fail(value)
+            except SchemaValidationError as e:
+                self.assertEqual(e.code, code, value)
+
+    def test_uuid_field(self):
+        schema = UUIDField()
+
+        self.assert_valid(schema, ['0f2d6c3e-8a4b-4c1d-9e8f-7a6b5c4d3e2f', '0F2D6C3E-8A4B-4C1D-9E8F-7A6B5C4D3E2F'])
+        self.assert_invalid(schema, ['0f2d6c3e8a4b4c1d9e8f7a6b5c4d3e2f', '0f2d6c3e-8a4b-4c1d-9e8f-7a6b5c4d3e2g', ''],
+                            'UUID_FORMAT')
+        self.assert_invalid(schema, [123], 'UUID_TYPE')
+
+        result = SchemaValidator(UUIDField(coerce=True), '0f2d6c3e-8a4b-4c1d-9e8f-7a6b5c4d3e2f').validate()
+
+        self.assertEqual(result, uuid.UUID('0f2d6c3e-8a4b-4c1d-9e8f-7a6b5c4d3e2f'))
+
+    def test_datetime_field(self):
+        schema = DateTimeField()
+
+        self.assert_valid(schema, [
+            '2019-08-04T10:20', '2019-08-04 10:20:30', '2019-08-04T10:20:30.123Z',
+            '2019-08-04T10:20:30,123456789+03:00', '2019-08-04T10:20:30-0300', '2019-08-04T10:20:30+03'
+        ])
+        self.assert_invalid(schema, [
+            '2019-08-04', '2019-13-04T10:20', '2019-02-30T10:20', '2019-08-04T24:00', '2019-08-04T10:20:30.Z',
+            '2019-08-04T10:20:30+3', '2019-08-04T10:20:30Zx', '２０19-08-04T10:20', '2019-08-04T10:20:30.1234567890'
+        ], 'DATETIME_FORMAT')
+        self.assert_invalid(DateTimeField(require_timezone=True), ['2019-08-04T10:20'], 'DATETIME_FORMAT')
+
+        result = SchemaValidator(DateTimeField(coerce=True), '2019-08-04T10:20:30.5-03:00').validate()
+
+        self.assertEqual(
+            result,
+            datetime(2019, 8, 4, 10, 20, 30, 500000, timezone(timedelta(hours=-3)))
+        )
+
+    def test_date_field(self):
+        schema = DateField(coerce=True)
+
+        self.assertEqual(SchemaValidator(schema, '2019-08-04').validate(), date(2019, 8, 4))
+        self.assert_invalid(schema, ['2019-08-4', '2019-08-04T10:20', '2019/08/04'], 'DATE_FORMAT')
+
+    def test_email_field(self):
+        schema = EmailField()
+
+        self.assert_valid(schema, ['dargor@blackmountain.com', 'a.b+tag@mail.co.uk', 'x@a-b.io'])
+        self.assert_invalid(schema, [
+            'dargor', '@blackmountain.com', 'dargor@', 'dargor@blackmountain', 'dar..gor@mountain.com',
+            'dargor@-mountain.com', 'dargor@mountain..com', 'dargor@1.2', 'dar gor@mountain.com'
+        ], 'EMAIL_FORMAT')
+
+    def test_ip_field(self):
+        self.assert_valid(IPField(), ['127.0.0.1', '::1'])
+        self.assert_invalid(IPField(), ['256.0.0.1', 'abc'], 'IP_FORMAT')
+        self.assert_invalid(IPField(version=4), ['::1'], 'IP_VERSION')
+
+        result = SchemaValidator(IPField(coerce=True), '10.0.0.1').validate()
+
+        self.assertEqual(result, ipaddress.ip_address('10.0.0.1'))
+
+    def test_uri_field(self):
+        schema = URIField(schemes=['http', 'https'], require_host=True)
+
+        self.assert_valid(schema, ['https://example.com/a?b=c#d', 'http://127.0.0.1:8080'])
+        self.assert_invalid(schema, ['example.com', 'https:///path', 'https://exa mple.com', '://a'], 'URI_FORMAT')
+        self.assert_invalid(schema, ['ftp://example.com'], 'URI_SCHEME')
+        self.assert_valid(URIField(), ['mailto:dargor@blackmountain.com', 'urn:isbn:0451450523'])
+
+
+class DictRulesTest(TestCase):
+    def build_schema(self, **kwargs):
+        return DictField(
+            schema={
+                'start': DateField(coerce=True),
+                'end': DateField(coerce=True),
+                'amount': FloatField(min=0.0),
+                'currency': EnumField(accept=['BRL', 'USD']),
+                'items': ListField(item_schema=FloatField()),
+                'total': FloatField()
+            },
+            optional_props=['end', 'amount', 'currency', 'items', 'total'],
+            rules=[
+                Compare('end', '>=', 'start'),
+                RequiredIf('currency', 'amount'),
+                PredicateRule(['items', 'total'], lambda values: sum(values['items']) == values['total'],
+                              code='TOTAL_MISMATCH', prop='total')
+            ],
+            **kwargs
+        )
+
+    def assert_error(self, schema, value, code: str, path: str, extra=None):
+        with self.assertRaises(SchemaValidationError) as context:
+            SchemaValidator(schema, value).validate()
+
+        self.assertEqual(context.exception.code, code)
+        self.assertEqual(context.exception.path, path)
+
+        if extra is not None:
+            self.assertEqual(context.exception.extra, extra)
+
+    def test_valid_values_should_pass(self):
+        schema = self.build_schema()
+
+        result = SchemaValidator(schema, {
+            'start': '2019-08-01',
+            'end': '2019-08-04',
+            'amount': 10.0,
+            'currency': 'BRL',
+            'items': [1.5, 2.5],
+            'total': 4.0
+        }).validate()
+
+        self.assertEqual(result['end'], date(2019, 8, 4))
+
+        SchemaValidator(schema, {'start': '2019-08-01'}).validate()
+
+    def test_compare_should_use_validated_values(self):
+        self.assert_error(
+            self.build_schema(),
+            {'start': '2019-08-04', 'end': '2019-08-01'},
+            'DICT_PROPS_COMPARE',
+            '$root.end',
+            {'prop': 'end', 'op': '>=', 'other': 'start'}
+        )
+
+    def test_required_if_should_raise_when_other_is_present(self):
+        self.assert_error(
+            self.build_schema(),
+            {'start': '2019-08-01', 'amount': 10.0},
+            'DICT_PROP_REQUIRED_IF',
+            '$root',
+            {'prop': 'currency', 'other': 'amount'}
+        )
+
+    def test_required_if_values_should_limit_the_condition(self):
+        schema = DictField(
+            schema={'kind': EnumField(accept=['person', 'company']), 'document': StrField()},
+            optional_props=['document'],
+            rules=[RequiredIf('document', 'kind', values=['company'])]
+        )
+
+        SchemaValidator(schema, {'kind': 'person'}).validate()
+
+        self.assert_error(schema, {'kind': 'company'}, 'DICT_PROP_REQUIRED_IF', '$root')
+
+    def test_mutually_exclusive_should_allow_one_prop(self):
+        schema = DictField(
+            schema={'cpf': StrField(), 'cnpj': StrField()},
+            optional_props=['cpf', 'cnpj'],
+            rules=[MutuallyExclusive(['cpf', 'cnpj'], required=True)]
+        )
+
+        SchemaValidator(schema, {'cpf': '1'}).validate()
+
+        self.assert_error(schema, {}, 'DICT_PROPS_EXCLUSIVE', '$root', {'props': ['cpf', 'cnpj'], 'present': []})
+        self.assert_error(schema, {'cpf': '1', 'cnpj': '2'}, 'DICT_PROPS_EXCLUSIVE', '$root', {
+            'props': ['cpf', 'cnpj'], 'present': ['cpf', 'cnpj']
+        })
+
+    def test_predicate_rule_should_use_its_code_and_prop(self):
+        self.assert_error(
+            self.build_schema(),
+            {'start': '2019-08-01', 'items': [1.0, 2.0], 'total': 4.0},
+            'TOTAL_MISMATCH',
+            '$root.total'
+        )
+
+    def test_rule_should_run_right_after_its_props(self):
+        # the rule of start/end fails before the invalid amount is checked
+        self.assert_error(
+            self.build_schema(),
+            {'start': '2019-08-04', 'end': '2019-08-01', 'amount': 'ten'},
+            'DICT_PROPS_COMPARE',
+            '$root.end'
+        )
+
+        # the invalid end fails before the rule
+        self.assert_error(self.build_schema(), {'start': '2019-08-04', 'end': 'x'}, 'DATE_FORMAT', '$root.end')
+
+    def test_adaptive_error_should_follow_schema_order(self):
+        schema = self.build_schema(adaptive=True)
+        schema.apply_prop_order(['amount', 'currency', 'total', 'items', 'end', 'start'])
+
+        self.assertEqual(schema.step_order[:3], ['amount', 'currency', schema.rules[1]])
+
+        self.assert_error(
+            schema,
+            {'start': '2019-08-04', 'end': '2019-08-01', 'amount': 'ten'},
+            'DICT_PROPS_COMPARE',
+            '$root.end'
+        )
+
+        self.assert_error(
+            schema,
+            {'start': '2019-08-04', 'end': '2019-08-05', 'amount': 1.0, 'items': [1.0], 'total': 2.0},
+            'DICT_PROP_REQUIRED_IF',
+            '$root'
+        )
+
+    def test_rules_without_failures_should_not_change_the_result(self):
+        schema = DictField(
+            schema={'name': StrField(), 'nick': StrField()},
+            optional_props=['nick'],
+            rules=[Compare('nick', '!=', 'name')]
+        )
+
+        self.assertEqual(SchemaValidator(schema, {'name': 'a', 'extra': 1}).validate(), {'name': 'a', 'extra': 1})
@@ -0,0 +1,213 @@
+from .py_schema import SchemaValidator, SchemaValidationError, \
+    IntField, FloatField, StrField, BoolField, DictField, ListField, \
+    EnumField, RegexField, FormatField
+
+# field class -> type of the values it accepts
+_ROOT_TYPES = {
+    DictField: dict,
+    ListField: list,
+    StrField: str,
+    RegexField: str,
+    FormatField: str,
+    IntField: int,
+    FloatField: float,
+    BoolField: bool,
+}
+
+
+def _root_type(schema):
+    for field_class in type(schema).__mro__:
+        if field_class in _ROOT_TYPES:
+            return _ROOT_TYPES[field_class]
+
+    return None
+
+
+def _literals(field):
+    if not isinstance(field, EnumField):
+        return None
+
+    try:
+        return frozenset(field.accept)
+    except TypeError:
+        return None
+
+
+def _constraints(schema) -> dict:
+    """
+    Returns {prop: (required, literals)} for the props of a DictField that can
+    discard the schema without validating it.
+    """
+    if not isinstance(schema, DictField):
+        return {}
+
+    constraints = {}
+
+    for prop, field in schema.schema.items():
+        required = prop not in schema.optional_props
+        literals = _literals(field)
+
+        if required or literals is not None:
+            constraints[prop] = (required, literals)
+
+    return constraints
+
+
+class _Leaf:
+    __slots__ = ('names',)
+
+    def __init__(self, names: list):
+        self.names = names
+
+
+class _Branch:
+    __slots__ = ('prop', 'absent', 'literals', 'other')
+
+    def __init__(self, prop, absent, literals: dict, other):
+        self.prop = prop
+        self.absent = absent
+        self.literals = literals
+        self.other = other
+
+
+class SchemaRegistry:
+    """
+    Finds which of the registered schemas a value matches.
+
+    The root types, the required props and the EnumField literals of the schemas are
+    compiled to a decision tree, shared by all the schemas, that selects a few candidates
+    before the full validation.
+    """
+
+    def __init__(self, leaf_size: int = 4, max_depth: int = 32):
+        self.leaf_size = leaf_size
+        self.max_depth = max_depth
+        self.schemas = {}
+        self.tree = None
+
+    def register(self, name: str, schema):
+        self.schemas[name] = schema
+        self.tree = None
+
+    def unregister(self, name: str):
+        del self.schemas[name]
+        self.tree = None
+
+    def build(self):
+        constraints = {name: _constraints(schema) for name, schema in self.schemas.items()}
+        root_types = {name: _root_type(schema) for name, schema in self.schemas.items()}
+
+        any_type = [name for name in self.schemas if root_types[name] is None]
+        types = {root_type for root_type in root_types.values() if root_type is not None}
+
+        self.tree = {
+            None: _Leaf(any_type)
+        }
+
+        for root_type in types:
+            names = [
+                name for name in self.schemas
+                if root_types[name] is None or root_types[name] is root_type
+            ]
+
+            self.tree[root_type] = self.build_node(names, constraints, frozenset(), 0)
+
+    def build_node(self, names: list, constraints: dict, tested: frozenset, depth: int):
+        if len(names) <= self.leaf_size or depth >= self.max_depth:
+            return _Leaf(names)
+
+        best = None
+
+        for prop in {prop for name in names for prop in constraints[name] if prop not in tested}:
+            children = self.split(names, constraints, prop)
+            size = max(len(child) for child in children[1].values()) if children[1] else 0
+            size = max(size, len(children[0]), len(children[2]))
+
+            if best is None or size < best[0]:
+                best = (size, prop, children)
+
+        if best is None or best[0] >= len(names):
+            return _Leaf(names)
+
+        _, prop, (absent, literals, other) = best
+        tested = tested | {prop}
+
+        return _Branch(
+            prop,
+            self.build_node(absent, constraints, tested, depth + 1),
+            {
+                literal: self.build_node(literal_names, constraints, tested, depth + 1)
+                for literal, literal_names in literals.items()
+            },
+            self.build_node(other, constraints, tested, depth + 1)
+        )
+
+    @staticmethod
+    def split(names: list, constraints: dict, prop):
+        """
+        Returns the names of the schemas that can match if the prop is absent,
+        for each literal and if the prop has any other value.
+        """
+        absent = []
+        other = []
+        all_literals = set()
+
+        for name in names:
+            required, literals = constraints[name].get(prop, (False, None))
+
+            if not required:
+                absent.append(name)
+
+            if literals is None:
+                other.append(name)
+            else:
+                all_literals.update(literals)
+
+        literal_names = {literal: [] for literal in all_literals}
+
+        for name in names:
+            literals = constraints[name].get(prop, (False, None))[1]
+
+            for literal, matching_names in literal_names.items():
+                if literals is None or literal in literals:
+                    matching_names.append(name)
+
+        return absent, literal_names, other
+
+    def candidates(self, value) -> list:
+        """
+        Returns the names of the schemas that the value can match, without validating them.
+        """
+        if self.tree is None:
+            self.build()
+
+        node = self.tree.get(type(value), self.tree[None])
+
+        while type(node) is _Branch:
+            prop = node.prop
+
+            if prop not in value:
+                node = node.absent
+                continue
+
+            try:
+                node = node.literals.get(value[prop], node.other)
+            except TypeError:
+                node = node.other
+
+        return node.names
+
+    def match(self, value) -> list:
+        """
+        Returns the names of the schemas that the value matches.
+        """
+        names = []
+
+        for name in self.candidates(value):
+            try:
+                SchemaValidator(self.schemas[name], value).validate()
+                names.append(name)
+            except SchemaValidationError:
+                pass
+
+        return names
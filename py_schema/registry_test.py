@@ -0,0 +1,80 @@
+from unittest import TestCase
+
+from py_schema import IntField, StrField, BoolField, DictField, ListField, EnumField, OrField
+from py_schema.registry import SchemaRegistry
+
+
+def build_registry(count: int) -> SchemaRegistry:
+    registry = SchemaRegistry()
+
+    for index in range(count):
+        registry.register(
+            'event_{}'.format(index),
+            DictField(
+                schema={
+                    'type': EnumField(accept=['event_{}'.format(index)]),
+                    'version': EnumField(accept=[1, 2]),
+                    'payload_{}'.format(index % 7): IntField()
+                },
+                optional_props=['version']
+            )
+        )
+
+    return registry
+
+
+class SchemaRegistryTest(TestCase):
+    def test_match_should_return_matching_schemas(self):
+        registry = build_registry(300)
+
+        self.assertEqual(
+            registry.match({'type': 'event_42', 'payload_0': 1}),
+            ['event_42']
+        )
+        self.assertEqual(
+            registry.match({'type': 'event_42', 'payload_1': 1}),
+            []
+        )
+        self.assertEqual(
+            registry.match({'type': 'event_42', 'version': 3, 'payload_0': 1}),
+            []
+        )
+
+    def test_candidates_should_be_narrowed(self):
+        registry = build_registry(300)
+
+        self.assertEqual(
+            registry.candidates({'type': 'event_42', 'payload_0': 1}),
+            ['event_42']
+        )
+        self.assertEqual(
+            registry.candidates({'type': ['unhashable']}),
+            []
+        )
+
+    def test_root_types_should_be_separated(self):
+        registry = SchemaRegistry(leaf_size=1)
+        registry.register('name', StrField())
+        registry.register('age', IntField())
+        registry.register('admin', BoolField())
+        registry.register('tags', ListField(item_schema=StrField()))
+        registry.register('id', OrField(schemas=[StrField(), IntField()]))
+
+        self.assertEqual(registry.match('Bruce'), ['name', 'id'])
+        self.assertEqual(registry.match(40), ['age', 'id'])
+        self.assertEqual(registry.match(True), ['admin'])
+        self.assertEqual(registry.match(['a']), ['tags'])
+        self.assertEqual(registry.match(1.5), [])
+
+    def test_schema_without_constraints_should_always_be_candidate(self):
+        registry = build_registry(50)
+        registry.register('any_dict', DictField(schema={}))
+
+        self.assertEqual(
+            registry.match({'type': 'event_7', 'payload_0': 1}),
+            ['event_7', 'any_dict']
+        )
+        self.assertEqual(
+            registry.match({}),
+            ['any_dict']
+        )
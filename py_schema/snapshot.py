@@ -0,0 +1,61 @@
+import gc
+import pickle
+
+SNAPSHOT_MAGIC = b'PYSCHEMA'
+SNAPSHOT_VERSION = 1
+
+
+def dump_snapshot(schemas: dict, file):
+    """
+    Writes the schemas (ex: {'user': DictField(...)}) to a snapshot file.
+
+    `file` can be a path or a binary file object.
+    """
+    if not hasattr(file, 'write'):
+        with open(file, 'wb') as fp:
+            return dump_snapshot(schemas, fp)
+
+    file.write(SNAPSHOT_MAGIC)
+    file.write(bytes([SNAPSHOT_VERSION]))
+
+    pickle.dump(schemas, file, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def load_snapshot(file, freeze: bool = False) -> dict:
+    """
+    Loads the schemas written by `dump_snapshot`.
+
+    If `freeze` is True, the loaded schemas are moved out of the garbage collector
+    tracking (see `freeze_schemas`).
+    """
+    if not hasattr(file, 'read'):
+        with open(file, 'rb') as fp:
+            return load_snapshot(fp, freeze=freeze)
+
+    header = file.read(len(SNAPSHOT_MAGIC) + 1)
+
+    if header[:len(SNAPSHOT_MAGIC)] != SNAPSHOT_MAGIC:
+        raise ValueError('not a py_schema snapshot')
+
+    if header[len(SNAPSHOT_MAGIC):] != bytes([SNAPSHOT_VERSION]):
+        raise ValueError('unsupported py_schema snapshot version')
+
+    schemas = pickle.load(file)
+
+    if freeze:
+        freeze_schemas()
+
+    return schemas
+
+
+def freeze_schemas():
+    """
+    Moves every object alive (the schemas loaded at the startup included) to the
+    permanent generation of the garbage collector.
+
+    Call it in the master process before forking the workers: the collections in
+    the workers will not touch the frozen objects, so their memory pages stay shared
+    copy-on-write instead of being duplicated in each worker.
+    """
+    gc.collect()
+    gc.freeze()
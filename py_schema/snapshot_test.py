@@ -0,0 +1,100 @@
+import io
+import pickle
+from dataclasses import dataclass
+from unittest import TestCase
+
+from py_schema import SchemaValidator, SchemaValidationError, \
+    IntField, StrField, DictField, ListField, RegexField, OrField, \
+    dump_snapshot, load_snapshot
+
+
+# the targets must be importable to be pickled
+@dataclass
+class Address:
+    street: str
+    number: int
+
+
+class PickleTest(TestCase):
+    def test_used_schema_should_not_pickle_last_value(self):
+        schema = ListField(
+            item_schema=DictField(
+                schema={
+                    'street': StrField(min_length=2),
+                    'number': OrField(
+                        schemas=[
+                            IntField(min=0),
+                            RegexField(regex='\\d+\\Z')
+                        ]
+                    )
+                },
+                target=Address
+            )
+        )
+
+        SchemaValidator(schema, [{'street': 'Dark Road', 'number': 12}]).validate()
+
+        loaded = pickle.loads(pickle.dumps(schema))
+
+        self.assertIsNone(loaded.value)
+        self.assertIsNone(loaded.ctx)
+        self.assertIsNone(loaded.item_schema.value)
+
+    def test_loaded_schema_should_validate_and_build(self):
+        schema = ListField(
+            item_schema=DictField(
+                schema={
+                    'street': StrField(min_length=2),
+                    'number': OrField(
+                        schemas=[
+                            IntField(min=0),
+                            RegexField(regex='\\d+\\Z')
+                        ]
+                    )
+                },
+                target=Address
+            )
+        )
+
+        loaded = pickle.loads(pickle.dumps(schema))
+
+        result = SchemaValidator(loaded, [{'street': 'Dark Road', 'number': '12'}]).validate()
+
+        self.assertEqual(result, [Address(street='Dark Road', number='12')])
+
+        try:
+            SchemaValidator(loaded, [{'street': 'D', 'number': 12}]).validate()
+            self.fail()
+        except SchemaValidationError as e:
+            self.assertEqual(e.code, 'STR_MIN_LENGTH')
+
+
+class SnapshotTest(TestCase):
+    def test_snapshot_should_load_the_schemas(self):
+        schema = ListField(
+            item_schema=DictField(
+                schema={
+                    'street': StrField(min_length=2),
+                    'number': OrField(
+                        schemas=[
+                            IntField(min=0),
+                            RegexField(regex='\\d+\\Z')
+                        ]
+                    )
+                },
+                target=Address
+            )
+        )
+        file = io.BytesIO()
+
+        dump_snapshot({'addresses': schema}, file)
+
+        file.seek(0)
+        schemas = load_snapshot(file)
+
+        self.assertEqual(list(schemas), ['addresses'])
+        self.assertIsInstance(schemas['addresses'], ListField)
+
+    def test_invalid_snapshot_should_raise_error(self):
+        with self.assertRaises(ValueError):
+            load_snapshot(io.BytesIO(b'not a snapshot'))